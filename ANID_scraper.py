@@ -10,24 +10,144 @@ Funcionalidades:
 - Extrae URLs de concursos desde https://anid.cl/concursos/
 - Compara con concursos ya registrados para obtener solo los nuevos
 - Extrae información detallada de cada concurso
-- Guarda la información en formato CSV
+- Guarda la información en una base de datos SQLite y la exporta a CSV
 
 Author: mlorca
 Date: 2023
 """
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import pandas as pd
 import time
 from datetime import datetime
 import os
-import requests
-from bs4 import BeautifulSoup
-from selenium.webdriver.chrome.options import Options
+import lxml.html
+from lxml import etree
 import random
+import threading
+import queue
+import atexit
+import sys
+from itertools import islice
+from contextlib import contextmanager
+from urllib.parse import urljoin, urlparse
+from anid_cache import HttpCache
+from anid_parser import extract_concurso_record, document_urls
+from anid_output import export_columnar, iter_csv_rows
+from anid_store import ConcursoStore, field_hash
+from anid_archive import HtmlArchive, iter_latest, shard_path, shard_paths
+from anid_scheduler import plan_refresh
+from anid_documents import DocumentStore
+from anid_metrics import metrics
+from anid_queue import open_queue
+
+LISTADO_URL = 'https://anid.cl/concursos/'
+# Páginas del listado generadas por JetSmartFilters (la página 1 es LISTADO_URL)
+LISTADO_PAGINA_URL = LISTADO_URL + 'jsf/jet-engine/pagenum/{page}/'
+PAGINAS_EN_PARALELO = 4
+# El recorrido del listado termina al encontrar este número de URLs ya
+# registradas seguidas, o una página completa sin URLs nuevas; así un concurso
+# destacado o reordenado que aparece primero no detiene la búsqueda. Cada
+# RECORRIDO_COMPLETO_DIAS días se recorre el listado completo
+DETENER_TRAS_CONOCIDAS = 5
+RECORRIDO_COMPLETO_DIAS = 7
+
+# Base de datos con las URLs (con IDs estables) y la información detallada; los
+# CSV se exportan desde ella al final de cada ejecución si EXPORTAR_CSV es True
+BASE_DATOS = 'ANID_concursos.sqlite'
+EXPORTAR_CSV = True
+URLS_CSV = 'ANID_concursos.csv'
+DETALLES_CSV = 'ANID_concursos_detallado.csv'
+
+# Salidas columnares opcionales generadas a partir de la base de datos (requieren
+# pyarrow); None las desactiva
+DETALLES_PARQUET = None  # por ejemplo 'ANID_concursos_detallado.parquet'
+DETALLES_FEATHER = None  # por ejemplo 'ANID_concursos_detallado.feather'
+
+DETAIL_COLUMNS = ['ID', 'URL', 'ESTADO', 'NOMBRE', 'TIPO', 'INICIO', 'CIERRE', 'FALLO',
+                  'PRESENTACIÓN', 'PÚBLICO OBJETIVO', 'BITÁCORA', 'RESULTADOS', 'DOCUMENTOS',
+                  'DOCUMENTOS_URLS', 'FECHA_EXTRACCION']
+
+# Límite de peticiones simultáneas por host (cortesía con anid.cl) y tamaño
+# del pool de conexiones keep-alive compartido
+MAX_CONCURRENCIA_POR_HOST = 4
+MAX_CONEXIONES = 16
+
+# Tasa objetivo (peticiones por segundo) y ráfaga máxima del limitador de tasa
+# compartido, y número de reintentos ante respuestas 429/5xx
+TASA_OBJETIVO = 2.0
+RAFAGA_MAXIMA = 4
+MAX_REINTENTOS = 3
+
+# Modo pipeline: tamaño de la cola de HTML descargado pendiente de procesar y
+# número de procesos de parseo (None usa todos los núcleos)
+TAMANO_COLA_HTML = 32
+PROCESOS_PARSEO = None
+
+# Registros guardados por transacción en la base de datos
+TAMANO_LOTE = 50
+
+# Tamaño del pool de navegadores del método de respaldo y número de páginas
+# que procesa cada navegador antes de reciclarlo
+TAMANO_POOL_NAVEGADORES = 2
+PAGINAS_POR_NAVEGADOR = 50
+
+# Caché HTTP en disco: archivo, tamaño máximo y segundos durante los que una
+# página se reutiliza sin revalidar según el ESTADO del concurso (el resto de
+# las páginas se revalida siempre con una petición condicional)
+USAR_CACHE = True
+CACHE_DB = 'ANID_cache.sqlite'
+CACHE_MAX_BYTES = 500 * 1024 * 1024
+CACHE_TTL_POR_ESTADO = {
+    'cerrado': 7 * 24 * 3600,
+    'fallado': 30 * 24 * 3600,
+    'desierto': 30 * 24 * 3600,
+}
+
+# Archivo permanente (WARC comprimido) con el HTML de cada concurso descargado,
+# usado por el modo reparse para volver a extraer la información sin conexión
+USAR_ARCHIVO = True
+ARCHIVO_HTML = 'ANID_archivo.warc.gz'
+
+# Documentos adjuntos (pestaña DOCUMENTOS): directorio donde se guardan según su
+# contenido y si se descargan al final de cada ejecución (sólo los de los
+# concursos extraídos en ella; `python ANID_scraper.py documentos` los descarga todos)
+DOCUMENTOS_DIR = 'ANID_documentos'
+DESCARGAR_DOCUMENTOS = False
+TAMANO_BLOQUE_DESCARGA = 256 * 1024
+
+# Métricas por etapa (contadores e histogramas de latencia): se desactivan con
+# METRICAS = False; los eventos se agregan como líneas JSON a METRICAS_LOG y, si
+# se indica METRICAS_PROMETHEUS, al final de cada ejecución se escribe ese
+# archivo en el formato de texto de Prometheus
+METRICAS = False
+METRICAS_LOG = 'ANID_metricas.jsonl'
+METRICAS_PROMETHEUS = None  # por ejemplo '/var/lib/node_exporter/textfile/anid.prom'
+
+# Cola de trabajo compartida por los procesos del modo distribuido (ver
+# anid_queue.py): ubicación, segundos de validez de una concesión sin renovar,
+# asignaciones de una URL antes de darla por fallida, URLs que toma cada
+# trabajador por vez y segundos de espera cuando no hay URLs pendientes
+COLA_TRABAJO = 'ANID_cola.sqlite'
+DURACION_CONCESION = 300
+MAX_INTENTOS_COLA = 3
+LOTE_TRABAJADOR = 2 * MAX_CONCURRENCIA_POR_HOST
+ESPERA_COLA = 5
+
+# Máximo de concursos que se descargan por ejecución en el modo incremental
+# (None: todos los que el planificador considera vencidos). Los intervalos de
+# actualización según ESTADO, CIERRE y FALLO se definen en anid_scheduler.py
+PRESUPUESTO_PETICIONES = None
+
+# Estados en los que un concurso todavía puede cambiar, que el planificador
+# actualiza con mayor frecuencia (comparación en minúsculas)
+ESTADOS_MUTABLES = {
+    '',
+    'abierto',
+    'próximamente',
+    'proximamente',
+    'en evaluación',
+    'en evaluacion',
+    'suspendido',
+}
 
 def get_user_agent():
     """
@@ -44,103 +164,397 @@ def get_user_agent():
     ]
     return random.choice(user_agents)
 
+_store = None
+
+def get_store():
+    """
+    Retorna la base de datos de concursos, creándola en la primera llamada.
+    
+    Si la base de datos está vacía y existen los CSV de versiones anteriores del
+    scraper, éstos se importan.
+    
+    Returns:
+        ConcursoStore: Base de datos compartida
+    """
+    global _store
+    if _store is None:
+        _store = ConcursoStore(BASE_DATOS)
+        if not _store.count() and (os.path.exists(URLS_CSV) or os.path.exists(DETALLES_CSV)):
+            imported = _store.import_csv(URLS_CSV, DETALLES_CSV)
+            print(f"Se importaron {imported} URLs desde {URLS_CSV} a {BASE_DATOS}")
+    return _store
+
+def load_existing_urls():
+    """
+    Retorna las URLs ya registradas en la base de datos.
+    
+    Returns:
+        set: URLs registradas
+    """
+    existing_urls = get_store().url_set()
+    print(f"Base de datos existente con {len(existing_urls)} URLs")
+    return existing_urls
+
 def get_anid_urls():
     """
-    Obtiene las URLs de los concursos y las compara con el CSV existente.
+    Obtiene las URLs de los concursos y las compara con las ya registradas.
+    
+    Primero intenta descargar el listado directamente por HTTP; sólo si ese
+    método falla se usa Chrome headless para recorrer la paginación. El
+    recorrido termina antes del final del listado cuando ya no aparecen URLs
+    nuevas (ver DETENER_TRAS_CONOCIDAS), salvo si el último recorrido completo
+    tiene más de RECORRIDO_COMPLETO_DIAS días. Cada recorrido queda registrado
+    en la base de datos (ver ConcursoStore.last_discovery).
     
     Returns:
         tuple: (new_urls, existing_urls)
             - new_urls (list): Lista de nuevas URLs encontradas
-            - existing_urls (set): Conjunto de URLs existentes en el CSV
+            - existing_urls (set): URLs ya registradas en la base de datos
     """
-    # Configurar Chrome para modo headless
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument('--disable-gpu')
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
+    store = get_store()
+    existing_urls = load_existing_urls()
+    last_full = store.last_discovery(complete=True)
+    full = last_full is None or (
+        datetime.now() - datetime.strptime(last_full['fecha'], '%Y-%m-%d %H:%M:%S')
+    ).days >= RECORRIDO_COMPLETO_DIAS
+    if full and existing_urls:
+        print("Recorriendo el listado completo")
+    try:
+        with metrics.span('listado', labels={'metodo': 'http'}) as span:
+            listado = get_anid_urls_http(existing_urls, full=full)
+            span.set(urls_nuevas=len(listado['urls']) if listado else 0)
+        if listado is not None:
+            store.record_discovery(listado['paginas'], listado['total_paginas'], len(listado['urls']),
+                                   listado['paginas'] >= listado['total_paginas'])
+            metrics.inc('urls_nuevas', len(listado['urls']))
+            metrics.inc('paginas_listado', listado['paginas'])
+            return listado['urls'], existing_urls
+        print("El listado HTTP no contiene concursos, usando Selenium")
+    except Exception as e:
+        print(f"Error obteniendo el listado por HTTP: {str(e)}, usando Selenium")
+    with metrics.span('listado', labels={'metodo': 'selenium'}) as span:
+        listado = get_anid_urls_selenium(existing_urls, full=full)
+        span.set(urls_nuevas=len(listado['urls']))
+    if listado['paginas']:
+        # Selenium no conoce el total de páginas: se registra 0
+        store.record_discovery(listado['paginas'], 0, len(listado['urls']), listado['completo'])
+    metrics.inc('urls_nuevas', len(listado['urls']))
+    metrics.inc('paginas_listado', listado['paginas'])
+    return listado['urls'], existing_urls
+
+def get_anid_urls_selenium(existing_urls, full=False):
+    """
+    Método de respaldo que recorre el listado de concursos con Selenium.
     
-    driver = webdriver.Chrome(options=chrome_options)
-    new_urls = []
-    existing_urls = set()
+    Args:
+        existing_urls (set): URLs ya registradas
+        full (bool): Si es True, recorre el listado completo
+        
+    Returns:
+        dict: Llaves urls (lista de nuevas URLs encontradas), paginas (páginas
+            recorridas) y completo (True si se llegó a la última página)
+    """
+    result = {'urls': [], 'paginas': 0, 'completo': False}
     
     try:
-        # Cargar URLs existentes si el archivo existe
-        if os.path.exists('ANID_concursos.csv'):
-            existing_df = pd.read_csv('ANID_concursos.csv')
-            existing_urls = set(existing_df['URL'].tolist())
-            print(f"CSV existente encontrado con {len(existing_urls)} URLs")
+        with browser_pool.driver() as driver:
+            collect_listado_urls_selenium(driver, existing_urls, result, full)
+    except Exception as e:
+        print(f"Error: {str(e)}")
+    
+    return result
+
+def collect_listado_urls_selenium(driver, existing_urls, result, full=False):
+    """
+    Recorre la paginación del listado con un navegador y agrega las URLs nuevas.
+    
+    Args:
+        driver (webdriver.Chrome): Navegador a utilizar
+        existing_urls (set): URLs ya registradas
+        result (dict): Recorrido en curso (ver get_anid_urls_selenium); se
+            agregan las nuevas URLs a result['urls'] y se actualizan las
+            llaves paginas y completo
+        full (bool): Si es True, no se detiene al encontrar URLs registradas
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+    
+    link_selector = 'a.elementor-button.elementor-button-link.elementor-size-sm'
+    
+    rate_limiter.acquire()
+    driver.get(LISTADO_URL)
+    stop = DiscoveryStop(existing_urls, DETENER_TRAS_CONOCIDAS if not full else None)
+    
+    while True:
+        WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, f".jet-listing-grid__items {link_selector}"))
+        )
         
-        driver.get("https://anid.cl/concursos/")
-        time.sleep(2)
+        links = driver.find_elements(By.CSS_SELECTOR, link_selector)
+        urls = [link.get_attribute('href') for link in links]
+        urls = [url for url in urls if url and not url.startswith(LISTADO_URL + 'jsf/')]
         
-        while True:
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "jet-listing-grid__items"))
-            )
-            time.sleep(2)
+        result['paginas'] += 1
+        if stop.process_page(urls, result['urls']):
+            break
             
-            links = driver.find_elements(
-                By.CSS_SELECTOR, 
-                'a.elementor-button.elementor-button-link.elementor-size-sm'
+        try:
+            pagination = WebDriverWait(driver, 5).until(
+                EC.presence_of_element_located((By.CLASS_NAME, "jet-filters-pagination"))
             )
             
-            found_existing = False
-            for link in links:
-                url = link.get_attribute('href')
-                if url and not url.startswith('https://anid.cl/concursos/jsf/'):
-                    if url in existing_urls:
-                        found_existing = True
-                        print(f"URL existente encontrada: {url}")
-                        break
-                    if url not in new_urls:
-                        new_urls.append(url)
-                        print(f"Nueva URL encontrada: {url}")
+            next_button = pagination.find_element(
+                By.CSS_SELECTOR,
+                'div.jet-filters-pagination__item.prev-next.next'
+            )
             
-            if found_existing:
-                print("Se encontró una URL existente, terminando búsqueda")
+            if next_button.is_displayed():
+                rate_limiter.acquire()
+                next_button.click()
+                # Esperar a que JetSmartFilters reemplace los resultados de la página
+                if links:
+                    WebDriverWait(driver, 10).until(EC.staleness_of(links[0]))
+            else:
+                print("No hay más páginas disponibles")
+                result['completo'] = True
                 break
                 
-            try:
-                pagination = WebDriverWait(driver, 5).until(
-                    EC.presence_of_element_located((By.CLASS_NAME, "jet-filters-pagination"))
-                )
-                
-                next_button = pagination.find_element(
-                    By.CSS_SELECTOR,
-                    'div.jet-filters-pagination__item.prev-next.next'
-                )
-                
-                if next_button.is_displayed():
-                    next_button.click()
-                    time.sleep(2)
+        except Exception as e:
+            # Sin paginación ni botón siguiente: la última página del listado
+            print("Fin de la navegación")
+            result['completo'] = True
+            break
+
+class RateLimiter:
+    """
+    Limitador de tasa adaptativo basado en un token bucket.
+    
+    Cada petición consume un token; los tokens se reponen a la tasa actual hasta
+    la capacidad de ráfaga. Ante respuestas 429/5xx la tasa se reduce a la mitad y
+    las peticiones se pausan según el header Retry-After; con respuestas exitosas
+    la tasa vuelve a subir gradualmente hasta la tasa objetivo.
+    """
+    
+    def __init__(self, rate=TASA_OBJETIVO, burst=RAFAGA_MAXIMA, min_rate=0.1, recovery=1.05):
+        """
+        Args:
+            rate (float): Tasa objetivo en peticiones por segundo
+            burst (int): Capacidad máxima del bucket
+            min_rate (float): Tasa mínima a la que puede bajar el limitador
+            recovery (float): Factor con el que sube la tasa tras cada respuesta exitosa
+        """
+        self.target_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.recovery = recovery
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+    
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+    
+    def acquire(self):
+        """Bloquea hasta que haya un token disponible y no haya una pausa activa."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return
                 else:
-                    print("No hay más páginas disponibles")
-                    break
-                    
-            except Exception as e:
-                print("Fin de la navegación")
-                break
-                
-    except Exception as e:
-        print(f"Error: {str(e)}")
-    finally:
-        driver.quit()
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
     
-    return new_urls, existing_urls
+    def report(self, status_code, retry_after=None):
+        """
+        Ajusta la tasa según la respuesta recibida.
+        
+        Args:
+            status_code (int): Código HTTP de la respuesta
+            retry_after (str): Valor del header Retry-After, si existe
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if status_code == 429 or status_code >= 500:
+                self.rate = max(self.min_rate, self.rate / 2)
+                delay = parse_retry_after(retry_after)
+                if delay is None:
+                    delay = 1 / self.rate
+                self._paused_until = max(self._paused_until, now + delay)
+                self._tokens = 0.0
+            else:
+                self.rate = min(self.target_rate, self.rate * self.recovery)
 
-def get_concurso_details(url):
+def parse_retry_after(value):
     """
-    Extrae la información detallada de un concurso usando requests y BeautifulSoup.
-    Si falla, utiliza Selenium como método de respaldo.
+    Convierte el header Retry-After a segundos de espera.
     
     Args:
-        url (str): URL del concurso a procesar
+        value (str): Valor del header (segundos o fecha HTTP)
         
     Returns:
-        dict: Diccionario con la información detallada del concurso o None si hay error
+        float: Segundos de espera o None si el valor no es válido
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+# Limitador compartido por el listado de concursos, la descarga de detalles y
+# el método de respaldo con Selenium
+rate_limiter = RateLimiter()
+
+_session = None
+_session_lock = threading.Lock()
+_host_semaphores = {}
+_http_cache = None
+_html_archive = None
+_document_store = None
+_work_queue = None
+
+def get_http_session():
+    """
+    Retorna la sesión HTTP compartida por todas las peticiones del scraper.
+    
+    La sesión mantiene un pool de conexiones keep-alive, de modo que las
+    conexiones TCP/TLS con anid.cl se reutilizan entre concursos.
+    
+    Returns:
+        requests.Session: Sesión compartida (se crea en la primera llamada)
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_CONEXIONES)
+            _session = requests.Session()
+            _session.mount('https://', adapter)
+            _session.mount('http://', adapter)
+        return _session
+
+def get_http_cache():
+    """
+    Retorna el caché HTTP en disco compartido por todas las descargas.
+    
+    Returns:
+        HttpCache: Caché compartido o None si USAR_CACHE es False
+    """
+    global _http_cache
+    if not USAR_CACHE:
+        return None
+    with _session_lock:
+        if _http_cache is None:
+            _http_cache = HttpCache(CACHE_DB, max_bytes=CACHE_MAX_BYTES,
+                                    ttl_por_estado=CACHE_TTL_POR_ESTADO)
+        return _http_cache
+
+def get_html_archive(path=None):
+    """
+    Retorna el archivo del HTML descargado compartido por todas las descargas.
+    
+    Args:
+        path (str): Si se indica, el archivo compartido pasa a ser éste (los
+            trabajadores del modo distribuido usan su propio fragmento); por
+            defecto se abre ARCHIVO_HTML
+    
+    Returns:
+        HtmlArchive: Archivo compartido o None si USAR_ARCHIVO es False
+    """
+    global _html_archive
+    if not USAR_ARCHIVO:
+        return None
+    with _session_lock:
+        if path is not None and _html_archive is not None and _html_archive.path != path:
+            _html_archive.close()
+            _html_archive = None
+        if _html_archive is None:
+            _html_archive = HtmlArchive(path or ARCHIVO_HTML)
+        return _html_archive
+
+def archive_html(url, html, fecha=None):
+    """
+    Guarda el HTML de un concurso en el archivo permanente.
+    
+    Args:
+        url (str): URL del concurso
+        html (str): HTML de la página
+        fecha (str): Fecha de descarga (por defecto, la actual)
+    """
+    archive = get_html_archive()
+    if archive is None:
+        return
+    try:
+        archive.append(url, html, fecha)
+    except Exception as e:
+        print(f"Error guardando {url} en el archivo HTML: {str(e)}")
+
+def get_host_semaphore(url, max_per_host=None):
+    """
+    Retorna el semáforo que limita las peticiones simultáneas al host de la URL.
+    
+    Args:
+        url (str): URL a la que se hará la petición
+        max_per_host (int): Máximo de peticiones simultáneas por host, usado al
+            crear el semáforo (None usa el valor actual de MAX_CONCURRENCIA_POR_HOST)
+        
+    Returns:
+        threading.BoundedSemaphore: Semáforo compartido para el host
+    """
+    host = urlparse(url).netloc
+    with _session_lock:
+        if host not in _host_semaphores:
+            _host_semaphores[host] = threading.BoundedSemaphore(max_per_host or MAX_CONCURRENCIA_POR_HOST)
+        return _host_semaphores[host]
+
+def release_on_close(response, semaphore):
+    """
+    Hace que cerrar una respuesta en streaming libere también el cupo del host,
+    de modo que el cuerpo se lea dentro del límite de concurrencia.
+    
+    Args:
+        response (requests.Response): Respuesta pedida con stream=True
+        semaphore (threading.BoundedSemaphore): Semáforo del host, ya adquirido
     """
-    headers = {
+    close = response.close
+    released = []
+    
+    def close_and_release():
+        try:
+            close()
+        finally:
+            if not released:
+                released.append(True)
+                semaphore.release()
+    
+    response.close = close_and_release
+
+def get_request_headers():
+    """
+    Retorna los headers HTTP usados para descargar las páginas de ANID.
+    
+    Returns:
+        dict: Headers con un User-Agent aleatorio
+    """
+    return {
         'User-Agent': get_user_agent(),
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
         'Accept-Language': 'es-ES,es;q=0.8,en-US;q=0.5,en;q=0.3',
@@ -150,237 +564,1500 @@ def get_concurso_details(url):
         'Cache-Control': 'max-age=0',
         'TE': 'Trailers'
     }
+
+def http_request(url, headers, method='GET', stream=False):
+    """
+    Hace una petición con la sesión compartida, respetando el limitador de tasa
+    y la concurrencia por host, y reintenta las respuestas 429/5xx.
     
-    try:
-        # Agregar un pequeño retraso aleatorio para evitar ser bloqueado
-        time.sleep(random.uniform(1, 3))
-        
-        session = requests.Session()
-        response = session.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'lxml')
-        
-        details = {
-            'URL': url,
-            'FECHA_EXTRACCION': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
-        
-        # Extraer información básica
-        estado = soup.select_one('span.estado')
-        details['ESTADO'] = estado.text.strip() if estado else ''
-        
-        # Extraer fechas
-        for field, text in [('INICIO', 'Inicio:'), ('CIERRE', 'Cierre:'), ('FALLO', 'Fallo estimado:')]:
-            element = soup.find('div', class_='jet-listing-dynamic-field__content', string=lambda s: text in str(s))
-            if element:
-                details[field] = element.text.split(text)[1].strip()
-            else:
-                details[field] = ''
+    Args:
+        url (str): URL de la petición
+        headers (dict): Headers de la petición
+        method (str): Método HTTP
+        stream (bool): Si es True, el cuerpo se lee después con iter_content() y
+            el cupo del host se libera recién al cerrar la respuesta, por lo que
+            quien llama debe cerrarla (por ejemplo, con un bloque with)
         
-        # Extraer tipo y nombre
-        tipo = soup.select_one('p.elementor-heading-title.elementor-size-default')
-        details['TIPO'] = tipo.text.strip() if tipo else ''
+    Returns:
+        requests.Response: Última respuesta recibida
         
-        nombre = soup.select_one('h1.elementor-heading-title.elementor-size-default')
-        details['NOMBRE'] = nombre.text.strip() if nombre else ''
+    Raises:
+        requests.exceptions.RequestException: Si la petición falla
+    """
+    for attempt in range(MAX_REINTENTOS + 1):
+        with metrics.span('espera_limitador', log=False):
+            rate_limiter.acquire()
+        semaphore = get_host_semaphore(url)
+        semaphore.acquire()
+        try:
+            with metrics.span('http', labels={'metodo': method}, url=url) as span:
+                response = get_http_session().request(method, url, headers=headers, timeout=10,
+                                                      stream=stream, allow_redirects=True)
+                span.set(estado=response.status_code)
+        except BaseException:
+            semaphore.release()
+            raise
+        if stream:
+            release_on_close(response, semaphore)
+        else:
+            semaphore.release()
+        metrics.inc('respuestas_http', estado=response.status_code)
+        if not stream:
+            metrics.inc('bytes_descargados', len(response.content))
+        rate_limiter.report(response.status_code, response.headers.get('Retry-After'))
+        if response.status_code != 429 and response.status_code < 500:
+            break
+        response.close()
+        print(f"Respuesta {response.status_code} para {url} (intento {attempt + 1})")
+    return response
+
+def fetch_page(url):
+    """
+    Descarga el HTML de una página de ANID usando la sesión compartida y el caché.
+    
+    Si la página está en el caché se hace una petición condicional; una respuesta
+    304 (o una entrada todavía dentro de su TTL) se sirve desde el caché.
+    
+    Args:
+        url (str): URL de la página a descargar
         
-        # Extraer contenido de las pestañas
-        tabs = {
-            'PRESENTACIÓN': '1911',
-            'PÚBLICO OBJETIVO': '1912',
-            'BITÁCORA': '1913',
-            'RESULTADOS': '1914',
-            'DOCUMENTOS': '1915'
-        }
+    Returns:
+        tuple: (html, cached)
+            - html (str): HTML de la página
+            - cached (dict): Entrada del caché si la página no cambió, None si se descargó
         
-        for tab_name, tab_id in tabs.items():
-            content = soup.select_one(f'#jet-tabs-content-{tab_id}')
-            if content:
-                text = content.text.strip()
-                if tab_name == 'PRESENTACIÓN':
-                    # Eliminar la línea de consultas
-                    text = text.split('Dirija sus consultas')[0].strip()
-                details[tab_name] = text
-            else:
-                details[tab_name] = ''
+    Raises:
+        requests.exceptions.RequestException: Si la descarga falla
+    """
+    cache = get_http_cache()
+    entry = cache.get(url) if cache else None
+    if entry and cache.is_fresh(entry):
+        metrics.inc('cache', resultado='vigente')
+        return entry['body'], entry
+    
+    headers = get_request_headers()
+    headers.update(HttpCache.conditional_headers(entry))
+    response = http_request(url, headers)
+    
+    if response.status_code == 304 and entry and entry['body'] is not None:
+        cache.revalidate(url, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        entry['fetched_at'] = time.time()
+        metrics.inc('cache', resultado='revalidado')
+        return entry['body'], entry
+    
+    response.raise_for_status()
+    if cache:
+        metrics.inc('cache', resultado='descargado')
+        cache.store(url, response.text, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+    return response.text, None
+
+def fetch_html(url):
+    """
+    Descarga el HTML de una página de ANID (ver fetch_page).
+    
+    Args:
+        url (str): URL de la página a descargar
         
-        return details
+    Returns:
+        str: HTML de la página
         
-    except requests.exceptions.RequestException as e:
-        print(f"Error procesando concurso {url}: {str(e)}")
-        # Si falla con requests, intentar con Selenium como respaldo
-        return get_concurso_details_selenium(url)
-    except Exception as e:
-        print(f"Error inesperado procesando concurso {url}: {str(e)}")
-        return None
+    Raises:
+        requests.exceptions.RequestException: Si la descarga falla
+    """
+    return fetch_page(url)[0]
 
-def get_concurso_details_selenium(url):
+_LISTADO_LINKS_XPATH = etree.XPath(
+    "//a[contains(concat(' ', normalize-space(@class), ' '), ' elementor-button ')"
+    " and contains(concat(' ', normalize-space(@class), ' '), ' elementor-button-link ')"
+    " and contains(concat(' ', normalize-space(@class), ' '), ' elementor-size-sm ')]/@href"
+)
+_LISTADO_PAGINAS_XPATH = etree.XPath(
+    "//div[contains(concat(' ', normalize-space(@class), ' '), ' jet-filters-pagination__item ')]/@data-value"
+)
+
+def parse_listado_page(html):
     """
-    Método de respaldo que usa Selenium para extraer información cuando requests falla.
+    Extrae las URLs de concursos y el número de páginas de una página del listado.
     
     Args:
-        url (str): URL del concurso a procesar
+        html (str): HTML de la página del listado
         
     Returns:
-        dict: Diccionario con la información detallada del concurso o None si hay error
+        tuple: (urls, total_pages)
+            - urls (list): URLs de concursos en el orden de la página
+            - total_pages (int): Última página indicada por la paginación (1 si no hay)
     """
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument('--disable-gpu')
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
-    chrome_options.add_argument(f'user-agent={get_user_agent()}')
+    root = lxml.html.fromstring(html, base_url=LISTADO_URL)
+    urls = []
+    for href in _LISTADO_LINKS_XPATH(root):
+        url = urljoin(LISTADO_URL, href.strip())
+        if url and not url.startswith(LISTADO_URL + 'jsf/') and url not in urls:
+            urls.append(url)
+    pages = [int(value) for value in _LISTADO_PAGINAS_XPATH(root) if value.strip().isdigit()]
+    return urls, max(pages, default=1)
+
+def fetch_listado_urls(page):
+    """
+    Descarga una página del listado y retorna las URLs de concursos que contiene.
     
-    driver = webdriver.Chrome(options=chrome_options)
-    try:
-        driver.get(url)
-        time.sleep(2)
-        
-        details = {
-            'URL': url,
-            'FECHA_EXTRACCION': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
-        
-        # Extraer información básica
-        try:
-            estado = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "span.estado"))
-            )
-            details['ESTADO'] = estado.text.strip()
-        except:
-            details['ESTADO'] = ''
-        
-        # Extraer fechas
-        for field, text in [('INICIO', 'Inicio:'), ('CIERRE', 'Cierre:'), ('FALLO', 'Fallo estimado:')]:
-            try:
-                element = driver.find_element(By.XPATH, 
-                    f"//div[contains(@class, 'jet-listing-dynamic-field__content') and contains(., '{text}')]")
-                details[field] = element.text.split(text)[1].strip()
-            except:
-                details[field] = ''
-        
-        # Extraer tipo y nombre
-        try:
-            tipo = driver.find_element(By.CSS_SELECTOR, "p.elementor-heading-title.elementor-size-default")
-            details['TIPO'] = tipo.text.strip()
-        except:
-            details['TIPO'] = ''
+    Args:
+        page (int): Número de página del listado (desde 2)
         
-        try:
-            nombre = driver.find_element(By.CSS_SELECTOR, "h1.elementor-heading-title.elementor-size-default")
-            details['NOMBRE'] = nombre.text.strip()
-        except:
-            details['NOMBRE'] = ''
+    Returns:
+        list: URLs de concursos de la página
+    """
+    return parse_listado_page(fetch_html(LISTADO_PAGINA_URL.format(page=page)))[0]
+
+class DiscoveryStop:
+    """
+    Criterio de término del recorrido del listado.
+    
+    El recorrido termina tras stop_after URLs registradas seguidas o tras una
+    página completa sin URLs nuevas. Una URL registrada aislada (un concurso
+    destacado o que cambió de posición) no lo detiene.
+    """
+    
+    def __init__(self, existing_urls, stop_after=DETENER_TRAS_CONOCIDAS):
+        """
+        Args:
+            existing_urls (set): URLs ya registradas
+            stop_after (int): URLs registradas seguidas tras las que se termina
+                (None recorre el listado completo)
+        """
+        self.existing_urls = existing_urls
+        self.stop_after = stop_after
+        self.consecutive = 0
+        self.seen = set()
+    
+    def process_page(self, urls, new_urls):
+        """
+        Procesa las URLs de una página del listado, en orden.
         
-        # Extraer contenido de las pestañas
-        tabs = {
-            'PRESENTACIÓN': '1911',
-            'PÚBLICO OBJETIVO': '1912',
-            'BITÁCORA': '1913',
-            'RESULTADOS': '1914',
-            'DOCUMENTOS': '1915'
-        }
+        Args:
+            urls (list): URLs de la página
+            new_urls (list): Lista donde se agregan las nuevas URLs encontradas
         
-        for tab_name, tab_id in tabs.items():
-            try:
-                tab = WebDriverWait(driver, 10).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, f"#jet-tabs-control-{tab_id}"))
-                )
-                driver.execute_script("arguments[0].click();", tab)
-                time.sleep(1)
-                
-                content = WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, f"#jet-tabs-content-{tab_id}"))
-                )
-                
-                text = content.text.strip()
-                if tab_name == 'PRESENTACIÓN':
-                    text = text.split('Dirija sus consultas')[0].strip()
-                details[tab_name] = text
-            except:
-                details[tab_name] = ''
+        Returns:
+            bool: True si el recorrido debe terminar
+        """
+        found_new = False
+        for url in urls:
+            # Una URL puede repetirse si el listado se desplaza durante el recorrido
+            if url in self.seen:
+                continue
+            self.seen.add(url)
+            if url in self.existing_urls:
+                self.consecutive += 1
+            else:
+                self.consecutive = 0
+                found_new = True
+                new_urls.append(url)
+                print(f"Nueva URL encontrada: {url}")
+            if self.stop_after is not None and self.consecutive >= self.stop_after:
+                print(f"Se encontraron {self.consecutive} URLs registradas seguidas, terminando búsqueda")
+                return True
+        if self.stop_after is not None and urls and not found_new:
+            print("Página sin URLs nuevas, terminando búsqueda")
+            return True
+        return False
+
+def get_anid_urls_http(existing_urls, max_workers=PAGINAS_EN_PARALELO, full=False):
+    """
+    Obtiene las URLs nuevas descargando las páginas del listado directamente por HTTP.
+    
+    La primera página indica el total de páginas; las siguientes se procesan en
+    orden hasta que se cumple el criterio de término (ver DiscoveryStop). Mientras
+    sólo aparecen URLs nuevas las páginas se descargan en lotes paralelos; tras
+    una URL registrada se descarga una página a la vez, ya que es probable que el
+    recorrido esté por terminar.
+    
+    Args:
+        existing_urls (set): URLs ya registradas
+        max_workers (int): Número de páginas del listado descargadas en paralelo
+        full (bool): Si es True, recorre el listado completo
         
-        return details
-    except Exception as e:
-        print(f"Error en método Selenium para {url}: {str(e)}")
+    Returns:
+        dict: Llaves urls (lista de nuevas URLs encontradas), paginas (páginas
+            recorridas) y total_paginas, o None si el listado no contiene concursos
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    urls, total_pages = parse_listado_page(fetch_html(LISTADO_URL))
+    if not urls:
         return None
-    finally:
-        driver.quit()
+    print(f"Listado de concursos con {total_pages} páginas")
+    
+    new_urls = []
+    stop = DiscoveryStop(existing_urls, None if full else DETENER_TRAS_CONOCIDAS)
+    result = {'urls': new_urls, 'paginas': 0, 'total_paginas': total_pages}
+    pages = [urls]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            for page_urls in pages:
+                result['paginas'] += 1
+                if stop.process_page(page_urls, new_urls):
+                    return result
+            page = result['paginas']
+            
+            if page >= total_pages:
+                print("No hay más páginas disponibles")
+                return result
+            
+            # Descargar el siguiente lote de páginas, en orden
+            size = 1 if stop.consecutive else max_workers
+            batch = range(page + 1, min(page + size, total_pages) + 1)
+            pages = list(executor.map(fetch_listado_urls, batch))
 
-def update_csv_with_new_urls(new_urls, existing_urls):
+def parse_concurso_details(url, html):
     """
-    Actualiza el CSV con las nuevas URLs encontradas.
+    Extrae la información detallada de un concurso a partir de su HTML.
+    
+    Implementación de referencia con BeautifulSoup; el scraper usa el extractor
+    equivalente y más rápido anid_parser.extract_concurso_record().
     
     Args:
-        new_urls (list): Lista de nuevas URLs a agregar
-        existing_urls (set): Conjunto de URLs ya existentes
+        url (str): URL del concurso
+        html (str): HTML de la página del concurso
         
     Returns:
-        pandas.DataFrame: DataFrame actualizado o None si hay error
+        dict: Diccionario con la información detallada del concurso
     """
-    try:
-        if os.path.exists('ANID_concursos.csv'):
-            df = pd.read_csv('ANID_concursos.csv')
+    from bs4 import BeautifulSoup
+    
+    soup = BeautifulSoup(html, 'lxml')
+    
+    details = {
+        'URL': url,
+        'FECHA_EXTRACCION': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+    
+    # Extraer información básica
+    estado = soup.select_one('span.estado')
+    details['ESTADO'] = estado.text.strip() if estado else ''
+    
+    # Extraer fechas
+    for field, text in [('INICIO', 'Inicio:'), ('CIERRE', 'Cierre:'), ('FALLO', 'Fallo estimado:')]:
+        element = soup.find('div', class_='jet-listing-dynamic-field__content', string=lambda s: text in str(s))
+        if element:
+            details[field] = element.text.split(text)[1].strip()
         else:
-            df = pd.DataFrame(columns=['ID', 'URL'])
-        
-        # Agregar nuevas URLs al principio del DataFrame
-        if new_urls:
-            new_df = pd.DataFrame({
-                'URL': new_urls
-            })
-            df = pd.concat([new_df, df], ignore_index=True)
-            df['ID'] = range(1, len(df) + 1)  # Actualizar IDs
-        
-        df.to_csv('ANID_concursos.csv', index=False)
-        print(f"CSV actualizado con {len(new_urls)} nuevas URLs")
-        return df
-    except Exception as e:
-        print(f"Error actualizando CSV: {str(e)}")
-        return None
+            details[field] = ''
+    
+    # Extraer tipo y nombre
+    tipo = soup.select_one('p.elementor-heading-title.elementor-size-default')
+    details['TIPO'] = tipo.text.strip() if tipo else ''
+    
+    nombre = soup.select_one('h1.elementor-heading-title.elementor-size-default')
+    details['NOMBRE'] = nombre.text.strip() if nombre else ''
+    
+    # Extraer contenido de las pestañas
+    tabs = {
+        'PRESENTACIÓN': '1911',
+        'PÚBLICO OBJETIVO': '1912',
+        'BITÁCORA': '1913',
+        'RESULTADOS': '1914',
+        'DOCUMENTOS': '1915'
+    }
+    
+    for tab_name, tab_id in tabs.items():
+        content = soup.select_one(f'#jet-tabs-content-{tab_id}')
+        if content:
+            text = content.text.strip()
+            if tab_name == 'PRESENTACIÓN':
+                # Eliminar la línea de consultas
+                text = text.split('Dirija sus consultas')[0].strip()
+            details[tab_name] = text
+        else:
+            details[tab_name] = ''
+    
+    # Conservar los enlaces a los documentos (bases, anexos, etc.)
+    documentos = soup.select_one(f"#jet-tabs-content-{tabs['DOCUMENTOS']}")
+    details['DOCUMENTOS_URLS'] = document_urls(
+        (a['href'] for a in documentos.find_all('a', href=True)), url
+    ) if documentos else ''
+    
+    return details
 
-def process_concursos():
+def download_concurso(url):
     """
-    Proceso principal que coordina la extracción y actualización de información.
+    Descarga la página de un concurso sin procesarla.
     
-    Este proceso:
-    1. Obtiene nuevas URLs de concursos
-    2. Actualiza el CSV con las nuevas URLs
-    3. Extrae información detallada de cada concurso
-    4. Guarda toda la información en un nuevo CSV
-    """
-    print("Iniciando extracción de URLs de ANID...")
-    new_urls, existing_urls = get_anid_urls()
+    Si la página no cambió desde la última descarga se retorna el registro guardado
+    en el caché; si la descarga con requests falla se usa Selenium como respaldo,
+    que entrega directamente el registro extraído.
     
-    if new_urls or existing_urls:
-        df = update_csv_with_new_urls(new_urls, existing_urls)
-        if df is not None:
-            print("\nIniciando extracción de información detallada...")
-            concursos_info = []
-            
-            for index, row in df.iterrows():
-                print(f"\nProcesando concurso {index + 1}/{len(df)}")
-                details = get_concurso_details(row['URL'])
-                if details:
-                    details['ID'] = row['ID']
-                    concursos_info.append(details)
-                    print("✓ Información extraída exitosamente")
-                else:
-                    print("✗ Error al extraer información")
-            
-            if concursos_info:
-                # Crear DataFrame con toda la información
-                new_df = pd.DataFrame(concursos_info)
-                columns = ['ID', 'URL', 'ESTADO', 'NOMBRE', 'TIPO', 'INICIO', 'CIERRE', 'FALLO',
-                          'PRESENTACIÓN', 'PÚBLICO OBJETIVO', 'BITÁCORA', 'RESULTADOS', 'DOCUMENTOS',
-                          'FECHA_EXTRACCION']
-                new_df = new_df[columns]
-                new_df.to_csv('ANID_concursos_detallado.csv', index=False)
-                print(f"\nSe guardaron {len(new_df)} concursos con información detallada")
+    Args:
+        url (str): URL del concurso a procesar
+        
+    Returns:
+        tuple: (html, details, fecha_extraccion); html es None cuando details ya
+            está extraído y details es None cuando hay que procesar html. Retorna
+            None si hay error
+    """
+    import requests
+    
+    try:
+        with metrics.span('descarga', url=url):
+            html, cached = fetch_page(url)
+        fecha = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        # Las páginas servidas por el caché ya se archivaron al descargarse,
+        # salvo que el archivo se haya activado después
+        archive = get_html_archive()
+        if archive is not None and (cached is None or url not in archive):
+            archive_html(url, html, fecha)
+        if cached and cached['record'] and all(column in cached['record'] for column in DETAIL_COLUMNS[1:]):
+            # La página no cambió: reutilizar el registro ya extraído (si tiene
+            # todas las columnas actuales), con la fecha de la última vez que se
+            # verificó contra el servidor
+            details = cached['record']
+            details['FECHA_EXTRACCION'] = datetime.fromtimestamp(cached['fetched_at']).strftime('%Y-%m-%d %H:%M:%S')
+            return None, details, details['FECHA_EXTRACCION']
+        return html, None, fecha
+        
+    except requests.exceptions.RequestException as e:
+        print(f"Error procesando concurso {url}: {str(e)}")
+        # Si falla con requests, intentar con Selenium como respaldo
+        metrics.inc('respaldo_selenium')
+        details = get_concurso_details_selenium(url)
+        return (None, details, details['FECHA_EXTRACCION']) if details else None
+    except Exception as e:
+        print(f"Error inesperado procesando concurso {url}: {str(e)}")
+        return None
+
+def save_parsed_record(url, details):
+    """
+    Guarda en el caché HTTP el registro extraído de una página recién descargada.
+    
+    Args:
+        url (str): URL del concurso
+        details (dict): Registro extraído
+    """
+    cache = get_http_cache()
+    if cache:
+        cache.save_record(url, details)
+
+def get_concurso_details(url):
+    """
+    Extrae la información detallada de un concurso usando requests y lxml.
+    Si falla, utiliza Selenium como método de respaldo.
+    
+    Args:
+        url (str): URL del concurso a procesar
+        
+    Returns:
+        dict: Diccionario con la información detallada del concurso o None si hay error
+    """
+    downloaded = download_concurso(url)
+    if downloaded is None:
+        return None
+    html, details, fecha = downloaded
+    if details is not None:
+        return details
+    
+    try:
+        with metrics.span('parseo', url=url):
+            details = extract_concurso_record(html, url, fecha)
+    except Exception as e:
+        print(f"Error inesperado procesando concurso {url}: {str(e)}")
+        return None
+    save_parsed_record(url, details)
+    return details
+
+def fetch_concursos_concurrently(urls, max_workers=None):
+    """
+    Extrae la información detallada de varios concursos en paralelo.
+    
+    Las peticiones comparten la sesión de get_http_session() y el número de
+    peticiones simultáneas a cada host queda limitado por MAX_CONCURRENCIA_POR_HOST.
+    Como máximo hay 2 * max_workers URLs en proceso: la siguiente se envía a
+    medida que termina una, de modo que la memoria queda acotada
+    independientemente del número de URLs.
+    
+    Args:
+        urls (iterable): URLs de los concursos a procesar
+        max_workers (int): Número de hilos de descarga (None usa MAX_CONCURRENCIA_POR_HOST)
+        
+    Yields:
+        tuple: (url, details) a medida que se completa cada concurso; details es
+            None si no se pudo extraer la información
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+    
+    max_workers = max_workers or MAX_CONCURRENCIA_POR_HOST
+    pending_urls = iter(urls)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        running = {}
+        try:
+            for url in islice(pending_urls, 2 * max_workers):
+                running[executor.submit(get_concurso_details, url)] = url
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    # Se suelta el future para no retener el registro ya entregado
+                    url = running.pop(future)
+                    details = future.result()
+                    next_url = next(pending_urls, None)
+                    if next_url is not None:
+                        running[executor.submit(get_concurso_details, next_url)] = next_url
+                    yield url, details
+        finally:
+            for future in running:
+                future.cancel()
+
+def pipeline_concursos(urls, fetch_workers=MAX_CONCURRENCIA_POR_HOST, parse_workers=PROCESOS_PARSEO,
+                       queue_size=TAMANO_COLA_HTML):
+    """
+    Extrae la información de varios concursos separando la descarga del parseo.
+    
+    Los hilos de descarga dejan el HTML en una cola acotada y un ProcessPoolExecutor
+    lo procesa con extract_concurso_record(), de modo que el parseo usa todos los
+    núcleos sin bloquear la descarga. Cuando la cola está llena los hilos de
+    descarga esperan, y como máximo hay 2 * parse_workers páginas en proceso, por
+    lo que la memoria queda acotada independientemente del número de URLs.
+    
+    Args:
+        urls (iterable): URLs de los concursos a procesar
+        fetch_workers (int): Número de hilos de descarga
+        parse_workers (int): Número de procesos de parseo (None usa todos los núcleos)
+        queue_size (int): Máximo de páginas descargadas pendientes de procesar
+        
+    Yields:
+        tuple: (url, details) a medida que se completa cada concurso; details es
+            None si no se pudo extraer la información
+    """
+    pending_urls = iter(urls)
+    urls_lock = threading.Lock()
+    html_queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    done_marker = object()
+    
+    def put(item):
+        while not stop.is_set():
+            try:
+                html_queue.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+    
+    def fetcher():
+        try:
+            while not stop.is_set():
+                with urls_lock:
+                    url = next(pending_urls, None)
+                if url is None:
+                    break
+                put((url, download_concurso(url)))
+        finally:
+            put(done_marker)
+    
+    threads = [threading.Thread(target=fetcher, daemon=True) for _ in range(fetch_workers)]
+    for thread in threads:
+        thread.start()
+    
+    import multiprocessing
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    
+    # Los procesos se crean con 'spawn' porque los hilos de descarga ya están
+    # corriendo y un fork podría heredar sus locks tomados
+    parse_workers = parse_workers or os.cpu_count() or 1
+    max_pending = 2 * parse_workers
+    with ProcessPoolExecutor(max_workers=parse_workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        parsing = {}
+        running = len(threads)
+        try:
+            while running or parsing:
+                # Entregar los registros ya procesados; si hay demasiados en
+                # proceso, esperar a que termine alguno antes de leer la cola
+                finished = [future for future in parsing if future.done()]
+                if not finished and (len(parsing) >= max_pending or (not running and parsing)):
+                    finished, _ = wait(parsing, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    url = parsing.pop(future)
+                    try:
+                        details = future.result()
+                        save_parsed_record(url, details)
+                    except Exception as e:
+                        print(f"Error inesperado procesando concurso {url}: {str(e)}")
+                        details = None
+                    yield url, details
+                
+                if not running or len(parsing) >= max_pending:
+                    continue
+                try:
+                    item = html_queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if item is done_marker:
+                    running -= 1
+                    continue
+                
+                url, downloaded = item
+                if downloaded is None:
+                    yield url, None
+                    continue
+                html, details, fecha = downloaded
+                if details is not None:
+                    yield url, details
+                else:
+                    parsing[executor.submit(extract_concurso_record, html, url, fecha)] = url
+        finally:
+            stop.set()
+            for future in parsing:
+                future.cancel()
+
+def create_chrome_driver():
+    """
+    Crea un navegador Chrome headless con un User-Agent aleatorio.
+    
+    Returns:
+        webdriver.Chrome: Navegador listo para usar
+    """
+    # Selenium tarda en importarse: sólo se carga cuando se usa el respaldo
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument(f'user-agent={get_user_agent()}')
+    return webdriver.Chrome(options=chrome_options)
+
+class BrowserPool:
+    """
+    Pool acotado de navegadores Chrome headless reutilizables.
+    
+    Los navegadores se mantienen abiertos entre páginas, de modo que el método de
+    respaldo no paga el arranque de Chrome por cada URL. Como máximo hay `size`
+    navegadores en uso a la vez; cada uno se recicla tras `max_pages` páginas o
+    cuando falla.
+    """
+    
+    def __init__(self, size=TAMANO_POOL_NAVEGADORES, max_pages=PAGINAS_POR_NAVEGADOR):
+        """
+        Args:
+            size (int): Número máximo de navegadores simultáneos
+            max_pages (int): Páginas que procesa un navegador antes de reciclarlo
+        """
+        self.max_pages = max_pages
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = queue.LifoQueue()
+    
+    @contextmanager
+    def driver(self):
+        """
+        Entrega un navegador del pool (creándolo si no hay uno disponible).
+        
+        Si el bloque lanza una excepción el navegador se descarta, ya que puede
+        haber quedado en un estado inconsistente.
+        
+        Yields:
+            webdriver.Chrome: Navegador para uso exclusivo dentro del bloque
+        """
+        with self._slots:
+            try:
+                driver, pages = self._idle.get_nowait()
+            except queue.Empty:
+                driver, pages = create_chrome_driver(), 0
+            
+            try:
+                yield driver
+            except BaseException:
+                self._quit(driver)
+                raise
+            
+            pages += 1
+            if pages >= self.max_pages:
+                self._quit(driver)
             else:
-                print("\nNo se pudo extraer información detallada")
-    else:
+                self._idle.put((driver, pages))
+    
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Error cerrando navegador: {str(e)}")
+    
+    def close(self):
+        """Cierra todos los navegadores inactivos del pool."""
+        while True:
+            try:
+                driver, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(driver)
+
+# Pool compartido por el listado con Selenium y el método de respaldo
+browser_pool = BrowserPool()
+atexit.register(browser_pool.close)
+
+def get_concurso_details_selenium(url):
+    """
+    Método de respaldo que usa Selenium para extraer información cuando requests falla.
+    
+    Usa un navegador del pool compartido, por lo que varias URLs pueden procesarse
+    en paralelo hasta TAMANO_POOL_NAVEGADORES.
+    
+    Args:
+        url (str): URL del concurso a procesar
+        
+    Returns:
+        dict: Diccionario con la información detallada del concurso o None si hay error
+    """
+    try:
+        with metrics.span('selenium', url=url), browser_pool.driver() as driver:
+            return extract_concurso_details_selenium(driver, url)
+    except Exception as e:
+        print(f"Error en método Selenium para {url}: {str(e)}")
+        return None
+
+def extract_concurso_details_selenium(driver, url):
+    """
+    Extrae la información detallada de un concurso con un navegador.
+    
+    Args:
+        driver (webdriver.Chrome): Navegador a utilizar
+        url (str): URL del concurso a procesar
+        
+    Returns:
+        dict: Diccionario con la información detallada del concurso
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+    
+    rate_limiter.acquire()
+    driver.get(url)
+    
+    details = {
+        'URL': url,
+        'FECHA_EXTRACCION': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+    
+    # Extraer información básica
+    try:
+        estado = WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "span.estado"))
+        )
+        details['ESTADO'] = estado.text.strip()
+    except:
+        details['ESTADO'] = ''
+    
+    # Extraer fechas
+    for field, text in [('INICIO', 'Inicio:'), ('CIERRE', 'Cierre:'), ('FALLO', 'Fallo estimado:')]:
+        try:
+            element = driver.find_element(By.XPATH, 
+                f"//div[contains(@class, 'jet-listing-dynamic-field__content') and contains(., '{text}')]")
+            details[field] = element.text.split(text)[1].strip()
+        except:
+            details[field] = ''
+    
+    # Extraer tipo y nombre
+    try:
+        tipo = driver.find_element(By.CSS_SELECTOR, "p.elementor-heading-title.elementor-size-default")
+        details['TIPO'] = tipo.text.strip()
+    except:
+        details['TIPO'] = ''
+    
+    try:
+        nombre = driver.find_element(By.CSS_SELECTOR, "h1.elementor-heading-title.elementor-size-default")
+        details['NOMBRE'] = nombre.text.strip()
+    except:
+        details['NOMBRE'] = ''
+    
+    # Extraer contenido de las pestañas
+    tabs = {
+        'PRESENTACIÓN': '1911',
+        'PÚBLICO OBJETIVO': '1912',
+        'BITÁCORA': '1913',
+        'RESULTADOS': '1914',
+        'DOCUMENTOS': '1915'
+    }
+    
+    for tab_name, tab_id in tabs.items():
+        try:
+            tab = WebDriverWait(driver, 10).until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, f"#jet-tabs-control-{tab_id}"))
+            )
+            driver.execute_script("arguments[0].click();", tab)
+            
+            # Esperar a que el contenido de la pestaña quede visible
+            content = WebDriverWait(driver, 10).until(
+                EC.visibility_of_element_located((By.CSS_SELECTOR, f"#jet-tabs-content-{tab_id}"))
+            )
+            
+            text = content.text.strip()
+            if tab_name == 'PRESENTACIÓN':
+                text = text.split('Dirija sus consultas')[0].strip()
+            details[tab_name] = text
+        except:
+            details[tab_name] = ''
+    
+    try:
+        links = driver.find_elements(By.CSS_SELECTOR, f"#jet-tabs-content-{tabs['DOCUMENTOS']} a[href]")
+        details['DOCUMENTOS_URLS'] = document_urls((link.get_attribute('href') or '' for link in links), url)
+    except:
+        details['DOCUMENTOS_URLS'] = ''
+    
+    archive_html(url, driver.page_source, details['FECHA_EXTRACCION'])
+    return details
+
+def get_document_store():
+    """
+    Retorna el almacenamiento de documentos adjuntos, creándolo en la primera llamada.
+    
+    Returns:
+        DocumentStore: Almacenamiento compartido
+    """
+    global _document_store
+    with _session_lock:
+        if _document_store is None:
+            _document_store = DocumentStore(DOCUMENTOS_DIR)
+        return _document_store
+
+def document_changed(entry, headers):
+    """
+    Indica si un documento cambió desde su última descarga según la respuesta a un HEAD.
+    
+    Args:
+        entry (dict): Documento guardado (ver DocumentStore.get())
+        headers (dict): Headers de la respuesta al HEAD
+        
+    Returns:
+        bool: False sólo si el ETag o el Last-Modified coinciden con los guardados
+    """
+    if entry['etag'] and headers.get('ETag'):
+        return entry['etag'] != headers.get('ETag')
+    if entry['last_modified'] and headers.get('Last-Modified'):
+        return entry['last_modified'] != headers.get('Last-Modified')
+    return True
+
+def download_documento(url):
+    """
+    Descarga un documento adjunto escribiéndolo a disco por bloques.
+    
+    Si el documento ya se descargó, primero se verifica con un HEAD si cambió.
+    Si existe una descarga parcial de una ejecución anterior, se retoma con
+    una petición Range (con If-Range, de modo que si el archivo cambió en el
+    servidor se descarga completo).
+    
+    Args:
+        url (str): URL del documento
+        
+    Returns:
+        str: 'nuevo', 'duplicado' (contenido ya guardado), 'sin cambios' o None si hay error
+    """
+    import requests
+    
+    docs = get_document_store()
+    headers = get_request_headers()
+    # Sin compresión, para que los offsets de Range correspondan a los bytes guardados
+    headers['Accept-Encoding'] = 'identity'
+    try:
+        entry = docs.get(url)
+        if entry:
+            response = http_request(url, headers, method='HEAD')
+            if response.ok and not document_changed(entry, response.headers):
+                docs.touch(url)
+                return 'sin cambios'
+        
+        path = docs.partial_path(url)
+        offset = os.path.getsize(path) if os.path.exists(path) else 0
+        validator = docs.partial_validator(url) if offset else None
+        request_headers = dict(headers)
+        if validator:
+            request_headers['Range'] = f'bytes={offset}-'
+            request_headers['If-Range'] = validator
+        response = http_request(url, request_headers, stream=True)
+        if response.status_code == 416 and validator:
+            # La descarga parcial no corresponde al archivo actual: se descarta y
+            # se pide el documento completo una sola vez
+            response.close()
+            docs.discard_partial(url)
+            response = http_request(url, headers, stream=True)
+        with response:
+            response.raise_for_status()
+            if response.status_code == 206:
+                mode = 'ab'
+            else:
+                mode = 'wb'
+                docs.start_partial(url, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            with open(path, mode) as f:
+                for block in response.iter_content(TAMANO_BLOQUE_DESCARGA):
+                    f.write(block)
+        _, stored = docs.commit(url, response.headers.get('Content-Type'))
+        return 'nuevo' if stored else 'duplicado'
+    except requests.exceptions.RequestException as e:
+        # La descarga parcial se conserva para retomarla en la siguiente ejecución
+        print(f"Error descargando documento {url}: {str(e)}")
+        return None
+    except Exception as e:
+        print(f"Error inesperado descargando documento {url}: {str(e)}")
+        return None
+
+def download_documents(records=None, max_workers=MAX_CONCURRENCIA_POR_HOST):
+    """
+    Descarga en paralelo los documentos adjuntos de los concursos.
+    
+    Args:
+        records (iterable): Registros con las llaves URL y DOCUMENTOS_URLS (por
+            defecto, todos los concursos de la base de datos)
+        max_workers (int): Número de descargas simultáneas
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    
+    docs = get_document_store()
+    if records is None:
+        records = get_store().iter_details()
+    urls = {}
+    for record in records:
+        links = [link for link in (record.get('DOCUMENTOS_URLS') or '').split('\n') if link]
+        docs.link(record['URL'], links)
+        urls.update(dict.fromkeys(links))
+    if not urls:
+        print("No hay documentos para descargar")
+        return
+    
+    print(f"\nDescargando {len(urls)} documentos en {DOCUMENTOS_DIR}...")
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(download_documento, url): url for url in urls}
+        for future in as_completed(futures):
+            status = future.result()
+            results[status] = results.get(status, 0) + 1
+    print(f"Documentos: {results.get('nuevo', 0)} nuevos, {results.get('duplicado', 0)} duplicados, "
+          f"{results.get('sin cambios', 0)} sin cambios, {results.get(None, 0)} con error")
+
+def export_columnar_outputs():
+    """
+    Genera las salidas Parquet/Feather configuradas en DETALLES_PARQUET y DETALLES_FEATHER.
+    """
+    if not (DETALLES_PARQUET or DETALLES_FEATHER):
+        return
+    try:
+        rows = export_columnar(get_store().iter_details(), DETAIL_COLUMNS, parquet_path=DETALLES_PARQUET,
+                               feather_path=DETALLES_FEATHER)
+        for path in (DETALLES_PARQUET, DETALLES_FEATHER):
+            if path:
+                print(f"Se exportaron {rows} concursos a {path}")
+    except ImportError:
+        print("No se pudo exportar a Parquet/Feather: instala pyarrow (pip install pyarrow)")
+    except Exception as e:
+        print(f"Error exportando a Parquet/Feather: {str(e)}")
+
+def export_metrics(elapsed):
+    """
+    Registra el resumen de la ejecución y exporta las métricas a Prometheus si está configurado.
+    
+    Args:
+        elapsed (float): Duración de la ejecución en segundos
+    """
+    if not metrics.enabled:
+        return
+    concursos = metrics.counter('concursos')
+    metrics.inc('ejecuciones')
+    metrics.observe('ejecucion', elapsed)
+    summary = metrics.summary()
+    summary['segundos'] = round(elapsed, 3)
+    summary['tasa_respaldo_selenium'] = metrics.counter('respaldo_selenium') / concursos if concursos else 0
+    metrics.event('resumen', **summary)
+    print(f"Métricas de la ejecución guardadas en {METRICAS_LOG}")
+    if METRICAS_PROMETHEUS:
+        try:
+            metrics.write_prometheus(METRICAS_PROMETHEUS)
+            print(f"Métricas exportadas a {METRICAS_PROMETHEUS}")
+        except Exception as e:
+            print(f"Error exportando métricas a Prometheus: {str(e)}")
+    metrics.close()
+
+def export_outputs(store, force=False):
+    """
+    Exporta la base de datos a los CSV y a las salidas columnares configuradas.
+    
+    Args:
+        store (ConcursoStore): Base de datos de concursos
+        force (bool): Exportar los CSV aunque EXPORTAR_CSV sea False
+    """
+    if EXPORTAR_CSV or force:
+        try:
+            with metrics.span('exportacion_csv'):
+                store.export_urls_csv(URLS_CSV)
+                total = store.export_details_csv(DETALLES_CSV, DETAIL_COLUMNS)
+            print(f"Se exportaron {total} concursos con información detallada a {DETALLES_CSV}")
+        except Exception as e:
+            print(f"Error exportando CSV: {str(e)}")
+    export_columnar_outputs()
+
+def discover_concursos():
+    """
+    Registra las nuevas URLs del listado sin extraer la información de los concursos.
+    
+    Returns:
+        int: Número de URLs nuevas
+    """
+    store = get_store()
+    print("Iniciando extracción de URLs de ANID...")
+    new_urls, _ = get_anid_urls()
+    added = store.add_urls(new_urls)
+    print(f"Se registraron {added} nuevas URLs ({store.count()} concursos en total)")
+    return added
+
+def plan_concursos(store, incremental=True, budget=PRESUPUESTO_PETICIONES):
+    """
+    Registra las nuevas URLs del listado y retorna los concursos a extraer.
+    
+    Args:
+        store (ConcursoStore): Base de datos de concursos
+        incremental (bool): Si es True, sólo los concursos nuevos o cuya
+            actualización está vencida (ver anid_scheduler.py)
+        budget (int): Máximo de concursos en el modo incremental (None: sin límite)
+    
+    Returns:
+        list: URLs a extraer, de mayor a menor prioridad, o None si la base de
+            datos está vacía
+    """
+    print("Iniciando extracción de URLs de ANID...")
+    new_urls, _ = get_anid_urls()
+    added = store.add_urls(new_urls)
+    print(f"Base de datos actualizada con {added} nuevas URLs")
+    
+    if not store.count():
         print("No se encontraron nuevas URLs para procesar")
+        return None
+    
+    resumed = store.resumed_count()
+    if resumed:
+        print(f"\nReanudando ejecución interrumpida: {resumed} concursos ya guardados")
+    if incremental:
+        cache = get_http_cache()
+        fresh = cache.fresh_urls() if cache else None
+        pending, due = plan_refresh(store.refresh_candidates(), ESTADOS_MUTABLES, budget, fresh_urls=fresh)
+        print(f"\nModo incremental: {due} de {store.count()} concursos con la actualización vencida")
+        if len(pending) < due:
+            print(f"Presupuesto de {budget} peticiones: se extraerán los {len(pending)} más prioritarios")
+    else:
+        pending = store.urls_to_scrape()
+    return [url for _, url in pending]
+
+def process_concursos(incremental=True, max_workers=MAX_CONCURRENCIA_POR_HOST, pipeline=False,
+                      budget=PRESUPUESTO_PETICIONES):
+    """
+    Proceso principal que coordina la extracción y actualización de información.
+    
+    Este proceso:
+    1. Obtiene nuevas URLs de concursos
+    2. Registra las nuevas URLs en la base de datos
+    3. Extrae información detallada de cada concurso (en modo incremental, sólo
+       de los concursos nuevos y de aquellos cuya actualización está vencida
+       según el planificador, de mayor a menor prioridad y hasta agotar el
+       presupuesto de peticiones)
+    4. Guarda la información en la base de datos a medida que se extrae, en
+       lotes transaccionales; si la ejecución se interrumpe, la siguiente retoma
+       el trabajo omitiendo los concursos ya guardados
+    5. Exporta la información a CSV (y opcionalmente a Parquet/Feather)
+    
+    Args:
+        incremental (bool): Si es True, sólo extrae los concursos nuevos o cuya
+            actualización está vencida (ver anid_scheduler.py)
+        max_workers (int): Número de concursos que se descargan en paralelo
+        pipeline (bool): Si es True, el HTML se procesa en un pool de procesos
+            separado de la descarga (ver pipeline_concursos)
+        budget (int): Máximo de concursos a descargar en el modo incremental
+            (None: sin límite)
+    """
+    metrics.configure(METRICAS, METRICAS_LOG)
+    start = time.perf_counter()
+    store = get_store()
+    urls = plan_concursos(store, incremental, budget)
+    if urls is None:
+        return
+    
+    print("\nIniciando extracción de información detallada...")
+    batch = []
+    extracted = 0
+    changes = 0
+    documents = []
+    try:
+        if pipeline:
+            results = pipeline_concursos(urls, fetch_workers=max_workers)
+        else:
+            results = fetch_concursos_concurrently(urls, max_workers=max_workers)
+        for position, (url, details) in enumerate(results, start=1):
+            print(f"\nProcesado concurso {position}/{len(urls)}: {url}")
+            if details:
+                batch.append(details)
+                if DESCARGAR_DOCUMENTOS:
+                    # Sólo los enlaces, para descargar los adjuntos al terminar
+                    documents.append({'URL': url, 'DOCUMENTOS_URLS': details.get('DOCUMENTOS_URLS', '')})
+                extracted += 1
+                metrics.inc('concursos', resultado='ok')
+                print("✓ Información extraída exitosamente")
+            else:
+                metrics.inc('concursos', resultado='error')
+                print("✗ Error al extraer información")
+            if len(batch) >= TAMANO_LOTE:
+                with metrics.span('guardado', registros=len(batch)):
+                    changes += store.upsert_details(batch)
+                batch = []
+    finally:
+        # Guardar el último lote también si la ejecución se interrumpe
+        with metrics.span('guardado', registros=len(batch)):
+            changes += store.upsert_details(batch)
+    
+    store.finish_run()
+    print(f"\nSe actualizaron {extracted} concursos con información detallada")
+    print(f"Se registraron {changes} cambios en concursos existentes")
+    export_outputs(store)
+    if DESCARGAR_DOCUMENTOS:
+        download_documents(documents, max_workers=max_workers)
+    export_metrics(time.perf_counter() - start)
+
+def get_work_queue():
+    """
+    Retorna la cola de trabajo del modo distribuido, abriéndola en la primera llamada.
+    
+    Returns:
+        WorkQueue: Cola compartida (ver anid_queue.py)
+    """
+    global _work_queue
+    with _session_lock:
+        if _work_queue is None:
+            _work_queue = open_queue(COLA_TRABAJO, lease_seconds=DURACION_CONCESION,
+                                     max_attempts=MAX_INTENTOS_COLA)
+        return _work_queue
+
+def enqueue_concursos(incremental=True, budget=PRESUPUESTO_PETICIONES):
+    """
+    Registra las nuevas URLs del listado y encola los concursos a extraer para
+    los trabajadores del modo distribuido (ver run_worker y collect_results).
+    
+    Args:
+        incremental (bool): Si es True, sólo los concursos nuevos o cuya
+            actualización está vencida
+        budget (int): Máximo de concursos en el modo incremental (None: sin límite)
+    """
+    urls = plan_concursos(get_store(), incremental, budget)
+    if urls is None:
+        return
+    added = get_work_queue().put(urls)
+    print(f"\nSe encolaron {added} concursos en {COLA_TRABAJO} ({len(urls) - added} ya estaban en la cola)")
+
+def run_worker(worker=None, max_workers=MAX_CONCURRENCIA_POR_HOST, batch_size=LOTE_TRABAJADOR,
+               wait_empty=False):
+    """
+    Extrae concursos de la cola de trabajo hasta que no queden pendientes.
+    
+    Cada lote se toma con una concesión que se renueva a medida que se completa
+    cada concurso; si el proceso se cae, las URLs sin terminar vuelven a la cola
+    cuando la concesión vence. Los resultados se reportan a la cola y el
+    coordinador los guarda en la base de datos con collect_results().
+    
+    Como varios procesos no pueden agregar páginas a un mismo archivo HTML, cada
+    trabajador archiva las páginas en su propio fragmento (ARCHIVO_HTML con el
+    identificador del trabajador antes de la extensión), que reparse_archive()
+    también recorre.
+    
+    Args:
+        worker (str): Identificador del trabajador (por defecto, equipo y PID)
+        max_workers (int): Número de concursos que se descargan en paralelo
+        batch_size (int): URLs que se toman de la cola por vez
+        wait_empty (bool): Si es True, espera nuevas URLs en vez de terminar
+            cuando la cola está vacía
+    """
+    import platform
+    
+    worker = worker or f"{platform.node() or 'trabajador'}-{os.getpid()}"
+    get_html_archive(shard_path(ARCHIVO_HTML, worker))
+    metrics.configure(METRICAS, METRICAS_LOG)
+    work_queue = get_work_queue()
+    print(f"Trabajador {worker} usando la cola {COLA_TRABAJO}")
+    completed = failed = 0
+    while True:
+        urls = work_queue.lease(worker, batch_size)
+        if not urls:
+            stats = work_queue.stats()
+            if not wait_empty and not stats['pendiente'] and not stats['asignada']:
+                break
+            # Otros trabajadores tienen concesiones vigentes que podrían vencer
+            time.sleep(ESPERA_COLA)
+            continue
+        remaining = set(urls)
+        for url, details in fetch_concursos_concurrently(urls, max_workers=max_workers):
+            remaining.discard(url)
+            if details:
+                work_queue.complete(worker, url, details)
+                metrics.inc('concursos', resultado='ok')
+                completed += 1
+                print(f"✓ {url}")
+            else:
+                work_queue.fail(worker, url, 'error al extraer la información')
+                metrics.inc('concursos', resultado='error')
+                failed += 1
+                print(f"✗ {url}")
+            work_queue.renew(worker, remaining)
+    print(f"\nTrabajador {worker}: {completed} concursos extraídos, {failed} con error")
+    metrics.close()
+
+def collect_results(batch_size=500):
+    """
+    Guarda en la base de datos los resultados reportados por los trabajadores.
+    
+    Los resultados se marcan como recogidos sólo después de guardarlos, de modo
+    que una interrupción no pierde ninguno. Cuando la cola no tiene URLs
+    pendientes ni asignadas la ejecución se da por terminada y se exportan los CSV.
+    
+    Args:
+        batch_size (int): Resultados guardados por transacción
+    """
+    store = get_store()
+    work_queue = get_work_queue()
+    saved = 0
+    changes = 0
+    while True:
+        results = work_queue.results(batch_size)
+        if not results:
+            break
+        changes += store.upsert_details([details for _, details in results])
+        work_queue.acknowledge([url for url, _ in results])
+        saved += len(results)
+    stats = work_queue.stats()
+    print(f"Se guardaron {saved} concursos reportados por los trabajadores ({changes} cambios)")
+    print(f"Cola: {stats['pendiente']} pendientes, {stats['asignada']} asignados, "
+          f"{stats['fallida']} fallidos")
+    if not stats['pendiente'] and not stats['asignada']:
+        store.finish_run()
+        export_outputs(store)
+
+def read_url_list(source):
+    """
+    Lee una lista de URLs de concursos.
+    
+    Args:
+        source (str): Ruta de un archivo de texto con una URL por línea (se
+            omiten las líneas vacías y las que empiezan con #), de un CSV con una
+            columna URL (por ejemplo, una exportación anterior) o '-' para leer
+            de la entrada estándar
+    
+    Returns:
+        list: URLs sin repetir, en el orden del archivo
+    """
+    if source != '-' and source.lower().endswith('.csv'):
+        lines = (row.get('URL') or '' for row in iter_csv_rows(source))
+        return list(dict.fromkeys(url.strip() for url in lines if url.strip()))
+    f = sys.stdin if source == '-' else open(source, encoding='utf-8')
+    try:
+        lines = (line.strip() for line in f)
+        return list(dict.fromkeys(line for line in lines if line and not line.startswith('#')))
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+def format_duration(seconds):
+    """
+    Args:
+        seconds (float): Duración en segundos
+    
+    Returns:
+        str: Duración en formato H:MM:SS
+    """
+    seconds = int(round(seconds))
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+def backfill_concursos(source, max_workers=MAX_CONCURRENCIA_POR_HOST, pipeline=False, chunk_size=TAMANO_LOTE,
+                       restart=False):
+    """
+    Extrae una lista de URLs entregada externamente, sin recorrer el listado.
+    
+    Las URLs se procesan con la misma descarga concurrente que
+    process_concursos() y sólo las que se extraen correctamente se registran en
+    la base de datos (un enlace roto no queda como concurso sin información).
+    Los concursos se guardan en lotes de chunk_size y cada lote queda
+    registrado como terminado en el avance propio del backfill, independiente
+    del de process_concursos(), de modo que si el backfill se interrumpe,
+    volver a ejecutarlo con la misma lista omite los concursos ya guardados.
+    Tras cada lote se muestra el avance, la velocidad y el tiempo restante
+    estimado.
+    
+    Args:
+        source (str): Archivo con las URLs o '-' para la entrada estándar (ver read_url_list)
+        max_workers (int): Número de concursos que se descargan en paralelo
+        pipeline (bool): Si es True, el HTML se procesa en un pool de procesos
+            separado de la descarga (ver pipeline_concursos)
+        chunk_size (int): Concursos guardados por lote
+        restart (bool): Si es True, ignora el avance de una ejecución anterior
+            con la misma lista
+    """
+    metrics.configure(METRICAS, METRICAS_LOG)
+    start = time.perf_counter()
+    urls = read_url_list(source)
+    if not urls:
+        print("La lista no contiene URLs")
+        return
+    store = get_store()
+    # Posición de cada URL en la lista, para registrar cada lote en ese orden
+    order = {url: position for position, url in enumerate(urls)}
+    unknown = len(set(urls) - store.url_set())
+    # El trabajo se identifica por su lista de URLs, también si se lee de la entrada estándar
+    job = field_hash('\n'.join(sorted(urls)))
+    if restart:
+        store.reset_backfill(job)
+    done = store.backfill_done(job)
+    pending = [url for url in urls if url not in done]
+    print(f"Backfill de {len(urls)} URLs ({unknown} no están registradas)")
+    if done:
+        print(f"{len(done)} concursos ya guardados por un backfill anterior con esta lista, "
+              f"se extraen los {len(pending)} restantes")
+    
+    total = len(pending)
+    processed = 0
+    extracted = 0
+    changes = 0
+    batch = []
+    
+    def save():
+        nonlocal changes
+        with metrics.span('guardado', registros=len(batch)):
+            store.add_urls(sorted((details['URL'] for details in batch), key=order.get))
+            changes += store.upsert_details(batch, track_progress=False)
+        store.mark_backfilled(job, [details['URL'] for details in batch])
+        batch.clear()
+    
+    try:
+        if pipeline:
+            results = pipeline_concursos(pending, fetch_workers=max_workers)
+        else:
+            results = fetch_concursos_concurrently(pending, max_workers=max_workers)
+        for url, details in results:
+            processed += 1
+            if details:
+                batch.append(details)
+                extracted += 1
+                metrics.inc('concursos', resultado='ok')
+            else:
+                metrics.inc('concursos', resultado='error')
+                print(f"✗ Error al extraer información: {url}")
+            if processed % chunk_size == 0 or processed == total:
+                save()
+                elapsed = time.perf_counter() - start
+                rate = processed / elapsed
+                eta = format_duration((total - processed) / rate)
+                print(f"{processed}/{total} ({processed / total:.1%}) · {rate:.1f} concursos/s · "
+                      f"restante {eta}")
+    finally:
+        # Guardar el último lote también si la ejecución se interrumpe
+        if batch:
+            save()
+    
+    elapsed = time.perf_counter() - start
+    print(f"\nBackfill terminado en {format_duration(elapsed)}: {extracted} concursos extraídos, "
+          f"{processed - extracted} con error, {changes} cambios")
+    if processed > extracted:
+        print("Los concursos con error se vuelven a intentar al ejecutar de nuevo el backfill con la misma lista")
+    export_outputs(store)
+    export_metrics(elapsed)
+
+def reparse_archive(workers=PROCESOS_PARSEO, chunk_size=256):
+    """
+    Vuelve a extraer la información de todos los concursos desde el archivo HTML, sin conexión.
+    
+    Se procesa la última versión archivada de cada concurso (en ARCHIVO_HTML y en
+    los fragmentos de los trabajadores del modo distribuido) con
+    extract_concurso_record() en un pool de procesos; FECHA_EXTRACCION es la
+    fecha en que se descargó la página. Permite poblar un campo nuevo o corregir
+    el extractor tras un cambio en el sitio sin volver a descargar nada.
+    
+    Args:
+        workers (int): Número de procesos de parseo (None usa todos los núcleos)
+        chunk_size (int): Páginas leídas del archivo por bloque
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    
+    if not USAR_ARCHIVO:
+        print("El archivo HTML está desactivado (USAR_ARCHIVO)")
+        return
+    # Otros procesos (una extracción o los trabajadores del modo distribuido)
+    # pueden estar agregando páginas a estos archivos: sólo se leen
+    paths = [path for path in [ARCHIVO_HTML] + shard_paths(ARCHIVO_HTML)
+             if os.path.exists(path) and os.path.exists(path + '.idx')]
+    archives = [HtmlArchive(path, read_only=True) for path in paths]
+    try:
+        total, pages = iter_latest(archives)
+        if not total:
+            print(f"No hay páginas archivadas en {ARCHIVO_HTML}")
+            return
+        store = get_store()
+        source = paths[0] if len(paths) == 1 else f"{ARCHIVO_HTML} y sus fragmentos ({len(paths)} archivos)"
+        print(f"Reprocesando {total} concursos desde {source}...")
+        start = time.perf_counter()
+        extracted = 0
+        changes = 0
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+            while True:
+                chunk = list(islice(pages, chunk_size))
+                if not chunk:
+                    break
+                futures = {executor.submit(extract_concurso_record, html, url, fecha): url
+                           for url, fecha, html in chunk}
+                batch = []
+                for future in as_completed(futures):
+                    url = futures[future]
+                    try:
+                        details = future.result()
+                    except Exception as e:
+                        print(f"Error inesperado procesando concurso {url}: {str(e)}")
+                        continue
+                    # Actualizar también el registro del caché, que se reutiliza si la página no cambia
+                    save_parsed_record(url, details)
+                    batch.append(details)
+                changes += store.upsert_details(batch)
+                extracted += len(batch)
+    finally:
+        for archive in archives:
+            archive.close()
+    store.finish_run()
+    elapsed = time.perf_counter() - start
+    print(f"Se reprocesaron {extracted} concursos en {elapsed:.1f} s ({changes} cambios)")
+    export_outputs(store)
+
+def print_changes_since(fecha, campos=None):
+    """
+    Muestra los cambios registrados en los concursos desde una fecha.
+    
+    Args:
+        fecha (str): Fecha en formato '%Y-%m-%d' o '%Y-%m-%d %H:%M:%S'
+        campos (list): Si se indica, sólo los cambios de estos campos
+    """
+    changes = get_store().changes_since(fecha, campos)
+    print(f"{len(changes)} cambios desde {fecha}")
+    for change in changes:
+        print(f"{change['FECHA']}  {change['CAMPO']:<16}  {change['URL']}")
+
+def print_search_results(query, limit=20):
+    """
+    Muestra los concursos que coinciden con una búsqueda de texto, del más al menos relevante.
+    
+    Args:
+        query (str): Texto a buscar (ver ConcursoStore.search)
+        limit (int): Máximo de resultados
+    """
+    start = time.perf_counter()
+    try:
+        results = get_store().search(query, limit)
+    except Exception as e:
+        print(f"Error en la búsqueda: {str(e)}")
+        return
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{len(results)} resultados para '{query}' ({elapsed:.1f} ms)")
+    for result in results:
+        print(f"\n[{result['ID']}] {result['NOMBRE']} ({result['ESTADO']})")
+        print(f"    {result['URL']}")
+        print(f"    {' '.join(result['FRAGMENTO'].split())}")
+
+def main(argv=None):
+    """
+    Punto de entrada de la línea de comandos.
+    
+    Sin subcomando se ejecuta process_concursos() completo (descubrir, extraer y
+    exportar). Selenium, BeautifulSoup, requests y pyarrow se importan sólo en
+    los subcomandos que los usan, de modo que los comandos que no descargan
+    páginas (o que descargan sólo el listado) arrancan rápido.
+    
+    Args:
+        argv (list): Argumentos (por defecto, sys.argv[1:])
+    
+    Returns:
+        int: Código de salida
+    """
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Extrae la información de los concursos de ANID.")
+    commands = parser.add_subparsers(dest='comando', metavar='comando')
+    
+    commands.add_parser('descubrir', aliases=['discover'],
+                        help="Registra las nuevas URLs del listado, sin extraer los concursos")
+    
+    extraer = commands.add_parser('extraer', aliases=['fetch'],
+                                  help="Descubre, extrae los concursos vencidos y exporta (por defecto)")
+    extraer.add_argument('--todos', action='store_true',
+                         help="Extraer todos los concursos sin usar el planificador")
+    extraer.add_argument('--presupuesto', type=int, default=PRESUPUESTO_PETICIONES,
+                         help="Máximo de concursos a descargar")
+    extraer.add_argument('--hilos', type=int, default=MAX_CONCURRENCIA_POR_HOST,
+                         help="Concursos que se descargan en paralelo")
+    extraer.add_argument('--pipeline', action='store_true',
+                         help="Procesar el HTML en un pool de procesos separado de la descarga")
+    
+    commands.add_parser('exportar', aliases=['export'], help="Exporta la base de datos a CSV (y Parquet/Feather)")
+    
+    reparse = commands.add_parser('reparse', help="Vuelve a extraer los concursos desde el archivo HTML")
+    reparse.add_argument('--procesos', type=int, default=PROCESOS_PARSEO,
+                         help="Procesos de parseo (por defecto, todos los núcleos)")
+    
+    backfill = commands.add_parser('backfill', help="Extrae una lista de URLs de un archivo o de la entrada estándar")
+    backfill.add_argument('archivo', help="Archivo con una URL por línea, CSV con columna URL o '-' (entrada estándar)")
+    backfill.add_argument('--hilos', type=int, default=MAX_CONCURRENCIA_POR_HOST,
+                          help="Concursos que se descargan en paralelo")
+    backfill.add_argument('--lote', type=int, default=TAMANO_LOTE, help="Concursos guardados por lote")
+    backfill.add_argument('--pipeline', action='store_true',
+                          help="Procesar el HTML en un pool de procesos separado de la descarga")
+    backfill.add_argument('--reiniciar', action='store_true',
+                          help="Ignorar el avance de una ejecución anterior con la misma lista")
+    
+    commands.add_parser('documentos', help="Descarga los documentos adjuntos de todos los concursos")
+    
+    buscar = commands.add_parser('buscar', help="Búsqueda de texto completo en los concursos")
+    buscar.add_argument('consulta', nargs='+')
+    buscar.add_argument('--limite', type=int, default=20, help="Máximo de resultados")
+    
+    cambios = commands.add_parser('cambios', help="Cambios registrados desde una fecha")
+    cambios.add_argument('fecha', help="Fecha en formato AAAA-MM-DD")
+    cambios.add_argument('campos', nargs='*', help="Campos a mostrar (por ejemplo ESTADO RESULTADOS)")
+    
+    encolar = commands.add_parser('encolar', help="Encola los concursos a extraer para los trabajadores")
+    encolar.add_argument('--todos', action='store_true', help="Encolar todos los concursos sin usar el planificador")
+    encolar.add_argument('--presupuesto', type=int, default=PRESUPUESTO_PETICIONES,
+                         help="Máximo de concursos a encolar")
+    
+    trabajar = commands.add_parser('trabajar', help="Extrae concursos de la cola de trabajo")
+    trabajar.add_argument('nombre', nargs='?', help="Identificador del trabajador (por defecto, equipo y PID)")
+    trabajar.add_argument('--hilos', type=int, default=MAX_CONCURRENCIA_POR_HOST,
+                          help="Concursos que se descargan en paralelo")
+    trabajar.add_argument('--esperar', action='store_true', help="Esperar nuevas URLs cuando la cola esté vacía")
+    
+    commands.add_parser('recoger', help="Guarda en la base de datos los resultados de los trabajadores")
+    
+    args = parser.parse_args(argv)
+    command = {'discover': 'descubrir', 'fetch': 'extraer', 'export': 'exportar'}.get(args.comando, args.comando)
+    
+    if command is None:
+        process_concursos()
+    elif command == 'descubrir':
+        discover_concursos()
+    elif command == 'extraer':
+        process_concursos(incremental=not args.todos, max_workers=args.hilos, pipeline=args.pipeline,
+                          budget=args.presupuesto)
+    elif command == 'exportar':
+        export_outputs(get_store(), force=True)
+    elif command == 'reparse':
+        reparse_archive(workers=args.procesos)
+    elif command == 'backfill':
+        backfill_concursos(args.archivo, max_workers=args.hilos, pipeline=args.pipeline, chunk_size=args.lote,
+                           restart=args.reiniciar)
+    elif command == 'documentos':
+        download_documents()
+    elif command == 'buscar':
+        print_search_results(' '.join(args.consulta), args.limite)
+    elif command == 'cambios':
+        print_changes_since(args.fecha, args.campos or None)
+    elif command == 'encolar':
+        enqueue_concursos(incremental=not args.todos, budget=args.presupuesto)
+    elif command == 'trabajar':
+        run_worker(args.nombre, max_workers=args.hilos, wait_empty=args.esperar)
+    elif command == 'recoger':
+        collect_results()
+    return 0
 
 if __name__ == "__main__":
-    process_concursos()
+    sys.exit(main())
@@ -0,0 +1,312 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Archivo permanente del HTML descargado por el ANID Scraper.
+
+Cada página se agrega al final de un archivo WARC comprimido (.warc.gz), como un
+registro "resource" en su propio miembro gzip, de modo que cualquier registro
+puede leerse haciendo seek a su posición sin descomprimir el resto. Un índice
+SQLite guarda la posición de cada registro según la URL y la fecha de descarga;
+si el índice se pierde o queda desactualizado tras una interrupción, se
+reconstruye recorriendo el archivo.
+
+El archivo permite volver a extraer la información de todos los concursos sin
+conexión (ver reparse_archive() en ANID_scraper.py).
+
+Como varios procesos no pueden agregar registros a un mismo archivo, cada
+trabajador del modo distribuido escribe en su propio fragmento (ver
+shard_path()); iter_latest() recorre la última versión de cada página en el
+archivo principal y sus fragmentos.
+"""
+
+import glob
+import gzip
+import os
+import pathlib
+import sqlite3
+import threading
+import zlib
+from datetime import datetime, timezone
+
+
+class HtmlArchive:
+    """
+    Archivo WARC de sólo agregado con un índice por URL y fecha de descarga.
+    """
+
+    def __init__(self, path, read_only=False):
+        """
+        Args:
+            path (str): Ruta del archivo .warc.gz (el índice se guarda en path + '.idx')
+            read_only (bool): Si es True, el archivo y su índice sólo se leen: no se
+                sincroniza el índice ni se trunca un registro final incompleto, de
+                modo que puede abrirse un archivo en el que otro proceso está
+                escribiendo (sólo se leen los registros ya indexados)
+        """
+        self.path = path
+        self.index_path = path + '.idx'
+        self.read_only = read_only
+        self._lock = threading.Lock()
+        if read_only:
+            uri = pathlib.Path(self.index_path).resolve().as_uri() + '?mode=ro'
+            self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            self._file = open(path, 'rb')
+            return
+        self._conn = sqlite3.connect(self.index_path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS registros (
+                url TEXT NOT NULL,
+                fecha TEXT NOT NULL,
+                offset INTEGER NOT NULL UNIQUE,
+                length INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS registros_url ON registros (url, fecha);
+        """)
+        self._conn.commit()
+        self._file = open(path, 'a+b')
+        self._recover()
+
+    def _recover(self):
+        # Sincroniza el índice con el archivo: indexa los registros agregados
+        # después de la última entrada del índice y elimina un registro final
+        # incompleto (escrito durante una interrupción)
+        size = os.path.getsize(self.path)
+        end = self._conn.execute("SELECT COALESCE(MAX(offset + length), 0) FROM registros").fetchone()[0]
+        if end > size:
+            # El archivo es más corto que el índice: reconstruirlo completo
+            self._conn.execute("DELETE FROM registros")
+            end = 0
+        if end == size:
+            self._conn.commit()
+            return
+        entries = []
+        for offset, length in self._scan(end):
+            url, fecha, _ = self._parse(self._read(offset, length))
+            entries.append((url, fecha, offset, length))
+            end = offset + length
+        self._conn.executemany("INSERT INTO registros (url, fecha, offset, length) VALUES (?, ?, ?, ?)", entries)
+        self._conn.commit()
+        if end < size:
+            self._file.truncate(end)
+
+    def _scan(self, start):
+        # Recorre los miembros gzip completos desde start
+        # Yields: (offset, length) de cada miembro
+        self._file.seek(start)
+        offset = start
+        decompressor = zlib.decompressobj(wbits=31)
+        consumed = 0
+        while True:
+            data = self._file.read(1024 * 1024)
+            if not data:
+                return
+            while data:
+                try:
+                    decompressor.decompress(data)
+                except zlib.error:
+                    return
+                if not decompressor.eof:
+                    consumed += len(data)
+                    break
+                length = consumed + len(data) - len(decompressor.unused_data)
+                yield offset, length
+                offset += length
+                data = decompressor.unused_data
+                decompressor = zlib.decompressobj(wbits=31)
+                consumed = 0
+                self._file.seek(offset + len(data))
+
+    def _read(self, offset, length):
+        self._file.seek(offset)
+        return gzip.decompress(self._file.read(length))
+
+    @staticmethod
+    def _parse(record):
+        # Retorna (url, fecha, html) de un registro WARC sin comprimir
+        header, _, body = record.partition(b'\r\n\r\n')
+        fields = {}
+        for line in header.decode('utf-8').split('\r\n')[1:]:
+            name, _, value = line.partition(':')
+            fields[name.strip().lower()] = value.strip()
+        length = int(fields['content-length'])
+        fecha = datetime.strptime(fields['warc-date'], '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc)
+        return (fields['warc-target-uri'], fecha.astimezone().strftime('%Y-%m-%d %H:%M:%S'),
+                body[:length].decode('utf-8'))
+
+    def append(self, url, html, fecha=None):
+        """
+        Agrega una página al archivo.
+
+        Args:
+            url (str): URL de la página
+            html (str): HTML de la página
+            fecha (str): Fecha de descarga en formato '%Y-%m-%d %H:%M:%S' (por defecto, la actual)
+        """
+        if self.read_only:
+            raise ValueError(f"El archivo {self.path} está abierto en modo de sólo lectura")
+        # uuid tarda en importarse y sólo se usa al escribir
+        import uuid
+
+        fecha = fecha or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        # Los registros guardan la fecha en UTC y con resolución de segundos
+        fecha_utc = datetime.strptime(fecha, '%Y-%m-%d %H:%M:%S').astimezone(timezone.utc)
+        body = html.encode('utf-8')
+        header = (
+            'WARC/1.0\r\n'
+            'WARC-Type: resource\r\n'
+            f'WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n'
+            f'WARC-Target-URI: {url}\r\n'
+            f'WARC-Date: {fecha_utc.strftime("%Y-%m-%dT%H:%M:%SZ")}\r\n'
+            'Content-Type: text/html; charset=utf-8\r\n'
+            f'Content-Length: {len(body)}\r\n'
+            '\r\n'
+        ).encode('utf-8')
+        data = gzip.compress(header + body + b'\r\n\r\n', mtime=0)
+        with self._lock:
+            self._file.seek(0, os.SEEK_END)
+            offset = self._file.tell()
+            self._file.write(data)
+            self._file.flush()
+            self._conn.execute("INSERT INTO registros (url, fecha, offset, length) VALUES (?, ?, ?, ?)",
+                               (url, fecha, offset, len(data)))
+            self._conn.commit()
+
+    def __contains__(self, url):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM registros WHERE url = ? LIMIT 1", (url,)).fetchone() is not None
+
+    def count(self):
+        """
+        Returns:
+            int: Número de URLs distintas en el archivo
+        """
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(DISTINCT url) FROM registros").fetchone()[0]
+
+    def get(self, url, fecha=None):
+        """
+        Retorna la última versión guardada de una página.
+
+        Args:
+            url (str): URL de la página
+            fecha (str): Si se indica, la última versión descargada hasta esa fecha
+
+        Returns:
+            tuple: (fecha, html) o None si la página no está en el archivo
+        """
+        query = "SELECT offset, length FROM registros WHERE url = ?"
+        params = [url]
+        if fecha:
+            query += " AND fecha <= ?"
+            params.append(fecha)
+        with self._lock:
+            row = self._conn.execute(query + " ORDER BY fecha DESC, offset DESC LIMIT 1", params).fetchone()
+            if row is None:
+                return None
+            _, fecha, html = self._parse(self._read(*row))
+        return fecha, html
+
+    def latest(self):
+        """
+        Retorna la posición de la última versión de cada página, en el orden del archivo.
+
+        Returns:
+            list: Tuplas (url, fecha, offset, length)
+        """
+        with self._lock:
+            return self._conn.execute("""
+                SELECT url, fecha, offset, length FROM registros r
+                WHERE offset = (SELECT offset FROM registros WHERE url = r.url
+                                ORDER BY fecha DESC, offset DESC LIMIT 1)
+                ORDER BY offset
+            """).fetchall()
+
+    def read(self, offset, length):
+        """
+        Lee un registro del archivo.
+
+        Args:
+            offset (int): Posición del registro (ver latest())
+            length (int): Largo comprimido del registro
+
+        Returns:
+            tuple: (url, fecha, html)
+        """
+        with self._lock:
+            record = self._read(offset, length)
+        return self._parse(record)
+
+    def iter_latest(self):
+        """
+        Recorre la última versión de cada página, en el orden del archivo.
+
+        Yields:
+            tuple: (url, fecha, html)
+        """
+        for _, _, offset, length in self.latest():
+            yield self.read(offset, length)
+
+    def close(self):
+        """Cierra el archivo y su índice."""
+        with self._lock:
+            self._file.close()
+            self._conn.close()
+
+
+def shard_path(path, name):
+    """
+    Retorna la ruta del fragmento de un archivo usado por un trabajador.
+
+    Args:
+        path (str): Ruta del archivo principal (por ejemplo 'ANID_archivo.warc.gz')
+        name (str): Identificador del trabajador
+
+    Returns:
+        str: Ruta con el identificador antes de la extensión ('ANID_archivo.<name>.warc.gz')
+    """
+    if path.endswith('.warc.gz'):
+        return f"{path[:-len('.warc.gz')]}.{name}.warc.gz"
+    return f"{path}.{name}"
+
+
+def shard_paths(path):
+    """
+    Retorna los fragmentos existentes de un archivo (ver shard_path()).
+
+    Args:
+        path (str): Ruta del archivo principal
+
+    Returns:
+        list: Rutas de los fragmentos, ordenadas
+    """
+    pattern = shard_path(glob.escape(path), '*')
+    return sorted(shard for shard in glob.glob(pattern) if not shard.endswith('.idx'))
+
+
+def iter_latest(archives):
+    """
+    Recorre la última versión de cada página en varios archivos (por ejemplo, el
+    principal y los fragmentos de los trabajadores).
+
+    Args:
+        archives (list): Archivos HtmlArchive
+
+    Returns:
+        tuple: (count, pages)
+            - count (int): Número de URLs distintas
+            - pages (iterator): Tuplas (url, fecha, html), agrupadas por archivo en el orden de cada uno
+    """
+    latest = {}
+    for position, archive in enumerate(archives):
+        for url, fecha, offset, length in archive.latest():
+            # A igual fecha prevalece el archivo indicado después
+            if url not in latest or fecha >= latest[url][0]:
+                latest[url] = (fecha, position, offset, length)
+    entries = sorted((position, offset, length) for _, position, offset, length in latest.values())
+
+    def pages():
+        for position, offset, length in entries:
+            yield archives[position].read(offset, length)
+
+    return len(entries), pages()
+
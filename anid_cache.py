@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Caché HTTP en disco para el ANID Scraper.
+
+Guarda por URL el cuerpo de la página (comprimido), los validadores ETag y
+Last-Modified y el registro ya extraído, de modo que las descargas posteriores
+se hacen con peticiones condicionales (If-None-Match / If-Modified-Since) y una
+respuesta 304 no obliga a volver a procesar la página.
+
+El caché tiene un tamaño máximo con expulsión LRU y permite definir, según el
+ESTADO del concurso, un tiempo durante el cual la copia guardada se usa sin
+consultar al servidor.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+
+from anid_record import CAMPOS, ConcursoRecord
+
+
+class HttpCache:
+    """
+    Caché HTTP persistente respaldado por SQLite.
+    """
+
+    def __init__(self, path, max_bytes=500 * 1024 * 1024, ttl_por_estado=None, default_ttl=0):
+        """
+        Args:
+            path (str): Ruta del archivo SQLite del caché
+            max_bytes (int): Tamaño máximo de los cuerpos guardados antes de expulsar entradas
+            ttl_por_estado (dict): Segundos durante los que una entrada se considera
+                vigente sin revalidar, según el ESTADO (en minúsculas) del concurso
+            default_ttl (int): TTL para entradas sin ESTADO o con un ESTADO no listado
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_por_estado = ttl_por_estado or {}
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        # Varios procesos (los trabajadores del modo distribuido) pueden compartir el caché
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body BLOB,
+                size INTEGER NOT NULL DEFAULT 0,
+                record TEXT,
+                estado TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)")
+        self._conn.commit()
+
+    def get(self, url):
+        """
+        Retorna la entrada guardada para una URL y la marca como usada.
+
+        Args:
+            url (str): URL de la página
+
+        Returns:
+            dict: Entrada con las llaves url, etag, last_modified, body, record
+                (ConcursoRecord), estado y fetched_at, o None si la URL no está en el caché
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, etag, last_modified, body, record, estado, fetched_at FROM cache WHERE url = ?",
+                (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE cache SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+
+        return {
+            'url': row[0],
+            'etag': row[1],
+            'last_modified': row[2],
+            'body': zlib.decompress(row[3]).decode('utf-8') if row[3] is not None else None,
+            'record': self._load_record(row[4]) if row[4] else None,
+            'estado': row[5],
+            'fetched_at': row[6],
+        }
+
+    @staticmethod
+    def _load_record(data):
+        # Las columnas que ya no existen (de registros guardados por versiones
+        # anteriores) se descartan
+        return ConcursoRecord({column: value for column, value in json.loads(data).items() if column in CAMPOS})
+
+    def is_fresh(self, entry, now=None):
+        """
+        Indica si una entrada puede usarse sin consultar al servidor.
+
+        Args:
+            entry (dict): Entrada retornada por get()
+            now (float): Timestamp actual (por defecto time.time())
+
+        Returns:
+            bool: True si la entrada está dentro de su TTL
+        """
+        if entry['body'] is None:
+            return False
+        estado = (entry['estado'] or '').strip().lower()
+        ttl = self.ttl_por_estado.get(estado, self.default_ttl)
+        now = time.time() if now is None else now
+        return ttl > 0 and now - entry['fetched_at'] < ttl
+
+    def fresh_urls(self, now=None):
+        """
+        Retorna las URLs cuya entrada puede usarse sin consultar al servidor.
+
+        Args:
+            now (float): Timestamp actual (por defecto time.time())
+
+        Returns:
+            set: URLs con una entrada dentro de su TTL (ver is_fresh)
+        """
+        if not self.ttl_por_estado and self.default_ttl <= 0:
+            return set()
+        now = time.time() if now is None else now
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, estado, fetched_at FROM cache WHERE body IS NOT NULL"
+            ).fetchall()
+        fresh = set()
+        for url, estado, fetched_at in rows:
+            ttl = self.ttl_por_estado.get((estado or '').strip().lower(), self.default_ttl)
+            if ttl > 0 and now - fetched_at < ttl:
+                fresh.add(url)
+        return fresh
+
+    @staticmethod
+    def conditional_headers(entry):
+        """
+        Construye los headers de una petición condicional para una entrada.
+
+        Args:
+            entry (dict): Entrada retornada por get() o None
+
+        Returns:
+            dict: Headers If-None-Match / If-Modified-Since (vacío si no hay validadores)
+        """
+        headers = {}
+        if entry and entry['body'] is not None:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url, body, etag=None, last_modified=None):
+        """
+        Guarda una página descargada, reemplazando la entrada anterior y su registro.
+
+        Args:
+            url (str): URL de la página
+            body (str): HTML de la página
+            etag (str): Header ETag de la respuesta
+            last_modified (str): Header Last-Modified de la respuesta
+        """
+        data = zlib.compress(body.encode('utf-8'))
+        now = time.time()
+        with self._lock:
+            self._conn.execute("""
+                INSERT INTO cache (url, etag, last_modified, body, size, record, estado, fetched_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, NULL, NULL, ?, ?)
+                ON CONFLICT (url) DO UPDATE SET
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    body = excluded.body,
+                    size = excluded.size,
+                    record = NULL,
+                    estado = NULL,
+                    fetched_at = excluded.fetched_at,
+                    accessed_at = excluded.accessed_at
+            """, (url, etag, last_modified, data, len(data), now, now))
+            self._conn.commit()
+        self.evict()
+
+    def revalidate(self, url, etag=None, last_modified=None):
+        """
+        Registra una respuesta 304: la copia guardada sigue vigente.
+
+        Args:
+            url (str): URL de la página
+            etag (str): Nuevo ETag, si el servidor lo envió
+            last_modified (str): Nuevo Last-Modified, si el servidor lo envió
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("""
+                UPDATE cache SET
+                    etag = COALESCE(?, etag),
+                    last_modified = COALESCE(?, last_modified),
+                    fetched_at = ?,
+                    accessed_at = ?
+                WHERE url = ?
+            """, (etag, last_modified, now, now, url))
+            self._conn.commit()
+
+    def save_record(self, url, record):
+        """
+        Asocia a la página guardada el registro extraído de ella.
+
+        Args:
+            url (str): URL de la página
+            record (dict o ConcursoRecord): Registro extraído (sus valores deben ser serializables a JSON)
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE cache SET record = ?, estado = ? WHERE url = ?",
+                (json.dumps(dict(record), ensure_ascii=False), record.get('ESTADO', ''), url)
+            )
+            self._conn.commit()
+
+    def evict(self):
+        """Expulsa las entradas usadas hace más tiempo hasta respetar max_bytes."""
+        with self._lock:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            expired = []
+            for url, size in self._conn.execute("SELECT url, size FROM cache ORDER BY accessed_at"):
+                if total <= self.max_bytes:
+                    break
+                expired.append((url,))
+                total -= size
+            self._conn.executemany("DELETE FROM cache WHERE url = ?", expired)
+            self._conn.commit()
+
+    def close(self):
+        """Cierra la conexión con la base de datos del caché."""
+        with self._lock:
+            self._conn.close()
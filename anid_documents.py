@@ -0,0 +1,254 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Almacenamiento de los documentos adjuntos de los concursos de ANID.
+
+Los archivos (bases, anexos, resoluciones...) se guardan según el SHA-256 de su
+contenido en objetos/<2 primeros caracteres>/<sha256>.<extensión>, de modo que
+un mismo archivo enlazado desde varios concursos se guarda una sola vez. Un
+índice SQLite asocia cada URL a su contenido y a los validadores ETag y
+Last-Modified de la última descarga, y cada concurso a sus documentos.
+
+Las descargas en curso se escriben en parciales/, junto con los validadores de
+la respuesta, para poder retomarlas con una petición Range.
+"""
+
+import hashlib
+import mimetypes
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse, unquote
+
+
+class DocumentStore:
+    """
+    Almacenamiento direccionado por contenido de los documentos descargados.
+    """
+
+    def __init__(self, root):
+        """
+        Args:
+            root (str): Directorio donde se guardan los documentos y su índice
+        """
+        self.root = root
+        os.makedirs(os.path.join(root, 'objetos'), exist_ok=True)
+        os.makedirs(os.path.join(root, 'parciales'), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(root, 'documentos.sqlite'), check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS documentos (
+                url TEXT PRIMARY KEY,
+                sha256 TEXT NOT NULL,
+                ruta TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                content_type TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS concurso_documentos (
+                concurso_url TEXT NOT NULL,
+                url TEXT NOT NULL,
+                PRIMARY KEY (concurso_url, url)
+            );
+            -- Validadores de las descargas parciales, usados en el header If-Range
+            CREATE TABLE IF NOT EXISTS parciales (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT
+            );
+        """)
+        self._conn.commit()
+
+    def get(self, url):
+        """
+        Retorna la última descarga completa de una URL.
+
+        Args:
+            url (str): URL del documento
+
+        Returns:
+            dict: Llaves url, sha256, ruta, size, content_type, etag y last_modified,
+                o None si el documento no se ha descargado
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, sha256, ruta, size, content_type, etag, last_modified FROM documentos WHERE url = ?",
+                (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(('url', 'sha256', 'ruta', 'size', 'content_type', 'etag', 'last_modified'), row))
+
+    def partial_path(self, url):
+        """
+        Args:
+            url (str): URL del documento
+
+        Returns:
+            str: Ruta del archivo donde se escribe la descarga en curso
+        """
+        name = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.root, 'parciales', name + '.part')
+
+    def partial_validator(self, url):
+        """
+        Retorna el validador de la descarga parcial de una URL, para el header If-Range.
+
+        Args:
+            url (str): URL del documento
+
+        Returns:
+            str: ETag o Last-Modified de la respuesta que originó la descarga parcial,
+                o None si no hay uno (en ese caso la descarga no puede retomarse)
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT etag, last_modified FROM parciales WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        etag, last_modified = row
+        # If-Range sólo admite ETags fuertes
+        if etag and not etag.startswith('W/'):
+            return etag
+        return last_modified
+
+    def start_partial(self, url, etag=None, last_modified=None):
+        """
+        Registra los validadores de una descarga que empieza desde cero.
+
+        Args:
+            url (str): URL del documento
+            etag (str): Header ETag de la respuesta
+            last_modified (str): Header Last-Modified de la respuesta
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parciales (url, etag, last_modified) VALUES (?, ?, ?)",
+                (url, etag, last_modified)
+            )
+            self._conn.commit()
+
+    def discard_partial(self, url):
+        """
+        Elimina la descarga parcial de una URL.
+
+        Args:
+            url (str): URL del documento
+        """
+        path = self.partial_path(url)
+        if os.path.exists(path):
+            os.remove(path)
+        with self._lock:
+            self._conn.execute("DELETE FROM parciales WHERE url = ?", (url,))
+            self._conn.commit()
+
+    def _extension(self, url, content_type):
+        extension = os.path.splitext(unquote(urlparse(url).path))[1].lower()
+        if 1 < len(extension) <= 6 and extension[1:].isalnum():
+            return extension
+        if content_type:
+            return mimetypes.guess_extension(content_type.split(';')[0].strip()) or ''
+        return ''
+
+    def commit(self, url, content_type=None):
+        """
+        Mueve una descarga parcial completa al almacenamiento por contenido.
+
+        Si ya existe un archivo con el mismo contenido, la descarga se descarta y
+        la URL apunta al archivo existente.
+
+        Args:
+            url (str): URL del documento
+            content_type (str): Header Content-Type de la respuesta
+
+        Returns:
+            tuple: (entry, stored)
+                - entry (dict): Documento registrado (ver get())
+                - stored (bool): False si el contenido ya estaba guardado
+        """
+        path = self.partial_path(url)
+        digest = hashlib.sha256()
+        size = 0
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+                size += len(block)
+        sha256 = digest.hexdigest()
+        ruta = os.path.join('objetos', sha256[:2], sha256 + self._extension(url, content_type))
+        destination = os.path.join(self.root, ruta)
+
+        with self._lock:
+            stored = False
+            existing = self._conn.execute("SELECT ruta FROM documentos WHERE sha256 = ? LIMIT 1", (sha256,)).fetchone()
+            if existing and os.path.exists(os.path.join(self.root, existing[0])):
+                ruta = existing[0]
+                os.remove(path)
+            elif os.path.exists(destination):
+                os.remove(path)
+            else:
+                os.makedirs(os.path.dirname(destination), exist_ok=True)
+                os.replace(path, destination)
+                stored = True
+            etag, last_modified = self._conn.execute(
+                "SELECT etag, last_modified FROM parciales WHERE url = ?", (url,)
+            ).fetchone() or (None, None)
+            self._conn.execute("""
+                INSERT OR REPLACE INTO documentos
+                    (url, sha256, ruta, size, content_type, etag, last_modified, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (url, sha256, ruta, size, content_type, etag, last_modified, time.time()))
+            self._conn.execute("DELETE FROM parciales WHERE url = ?", (url,))
+            self._conn.commit()
+        return self.get(url), stored
+
+    def touch(self, url):
+        """
+        Registra que un documento se verificó y no cambió.
+
+        Args:
+            url (str): URL del documento
+        """
+        with self._lock:
+            self._conn.execute("UPDATE documentos SET fetched_at = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+
+    def link(self, concurso_url, urls):
+        """
+        Asocia a un concurso los documentos enlazados en su pestaña DOCUMENTOS.
+
+        Args:
+            concurso_url (str): URL del concurso
+            urls (list): URLs de los documentos
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM concurso_documentos WHERE concurso_url = ?", (concurso_url,))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO concurso_documentos (concurso_url, url) VALUES (?, ?)",
+                [(concurso_url, url) for url in urls]
+            )
+            self._conn.commit()
+
+    def documents_for(self, concurso_url):
+        """
+        Retorna los documentos descargados de un concurso.
+
+        Args:
+            concurso_url (str): URL del concurso
+
+        Returns:
+            list: Tuplas (url, ruta) con la ruta absoluta de cada archivo descargado
+        """
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT l.url, d.ruta FROM concurso_documentos l
+                JOIN documentos d ON d.url = l.url
+                WHERE l.concurso_url = ?
+            """, (concurso_url,)).fetchall()
+        return [(url, os.path.join(self.root, ruta)) for url, ruta in rows]
+
+    def close(self):
+        """Cierra el índice de documentos."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,290 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Métricas y trazas del ANID Scraper.
+
+Registra contadores e histogramas de latencia por etapa (listado, descarga,
+parseo, Selenium, escritura) y, opcionalmente, una línea JSON por evento en un
+archivo de log. Al final de una ejecución las métricas pueden exportarse en el
+formato de texto de Prometheus (por ejemplo, para el textfile collector de
+node_exporter).
+
+Cuando las métricas están desactivadas, span() retorna un context manager vacío
+compartido y inc()/observe() retornan de inmediato, de modo que la
+instrumentación casi no tiene costo.
+"""
+
+import bisect
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+# Límites superiores (en segundos) de los buckets de los histogramas de latencia
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class _NullSpan:
+    # Span que no registra nada, usado cuando las métricas están desactivadas
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **fields):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    # Mide la duración de una etapa, la registra en el histograma <name> y
+    # escribe un evento en el log; si la etapa lanza una excepción se marca
+    # con error
+
+    __slots__ = ('metrics', 'name', 'labels', 'fields', 'log', 'start')
+
+    def __init__(self, metrics, name, labels, fields, log):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+        self.fields = fields
+        self.log = log
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def set(self, **fields):
+        """Agrega campos al evento del log (por ejemplo, el resultado de la etapa)."""
+        self.fields.update(fields)
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        self.metrics.observe(self.name, duration, **self.labels)
+        if exc_type is not None:
+            self.metrics.inc(self.name + '_errores', **self.labels)
+            self.fields['error'] = exc_type.__name__
+        if self.log:
+            self.metrics.event(self.name, segundos=round(duration, 6), **self.labels, **self.fields)
+        return False
+
+
+class Metrics:
+    """
+    Registro de contadores, histogramas y eventos, seguro entre hilos.
+    """
+
+    def __init__(self, enabled=False, log_path=None):
+        """
+        Args:
+            enabled (bool): Si es False no se registra nada
+            log_path (str): Archivo donde se agrega una línea JSON por evento (opcional)
+        """
+        self._lock = threading.Lock()
+        self._log = None
+        self.configure(enabled, log_path)
+
+    def configure(self, enabled, log_path=None):
+        """
+        Activa o desactiva las métricas y reinicia los valores registrados.
+
+        Args:
+            enabled (bool): Si es False no se registra nada
+            log_path (str): Archivo donde se agrega una línea JSON por evento (opcional)
+        """
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+            self.enabled = enabled
+            self.log_path = log_path
+            self.counters = {}
+            self.histograms = {}
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def inc(self, name, value=1, **labels):
+        """
+        Incrementa un contador.
+
+        Args:
+            name (str): Nombre del contador
+            value (float): Incremento
+            **labels: Etiquetas del contador (por ejemplo estado=200)
+        """
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        """
+        Registra una duración en un histograma.
+
+        Args:
+            name (str): Nombre del histograma
+            seconds (float): Duración en segundos
+            **labels: Etiquetas del histograma
+        """
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        index = bisect.bisect_left(BUCKETS, seconds)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = {'buckets': [0] * (len(BUCKETS) + 1), 'sum': 0.0, 'count': 0}
+            histogram['buckets'][index] += 1
+            histogram['sum'] += seconds
+            histogram['count'] += 1
+
+    def span(self, name, labels=None, log=True, **fields):
+        """
+        Mide una etapa del proceso.
+
+        Uso:
+            with metrics.span('descarga', url=url) as span:
+                ...
+                span.set(resultado='cache')
+
+        Args:
+            name (str): Nombre de la etapa (y de su histograma de latencia)
+            labels (dict): Etiquetas del histograma (deben tener pocos valores posibles)
+            log (bool): Si es False sólo se registra la duración, sin evento en el log
+            **fields: Campos adicionales del evento en el log (por ejemplo la URL)
+
+        Returns:
+            Context manager; vacío si las métricas están desactivadas
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, labels or {}, fields, log)
+
+    def event(self, name, **fields):
+        """
+        Escribe un evento como una línea JSON en el log.
+
+        Args:
+            name (str): Nombre del evento
+            **fields: Campos del evento
+        """
+        if not self.enabled or not self.log_path:
+            return
+        line = json.dumps({'ts': datetime.now().isoformat(timespec='milliseconds'), 'evento': name, **fields},
+                          ensure_ascii=False, default=str)
+        with self._lock:
+            if self._log is None:
+                self._log = open(self.log_path, 'a', encoding='utf-8')
+            self._log.write(line + '\n')
+            self._log.flush()
+
+    def counter(self, name, **labels):
+        """
+        Retorna el valor de un contador (la suma de todas sus etiquetas si no se indican).
+
+        Args:
+            name (str): Nombre del contador
+            **labels: Etiquetas del contador
+
+        Returns:
+            float: Valor del contador
+        """
+        with self._lock:
+            if labels:
+                return self.counters.get(self._key(name, labels), 0)
+            return sum(value for (counter, _), value in self.counters.items() if counter == name)
+
+    def summary(self):
+        """
+        Retorna un resumen de las métricas registradas.
+
+        Returns:
+            dict: Contadores (por nombre y etiquetas) e histogramas (count, sum,
+                promedio y percentil 95 aproximado por bucket)
+        """
+        def label(name, labels):
+            return name + ''.join(f'[{key}={value}]' for key, value in labels)
+
+        with self._lock:
+            counters = {label(name, labels): value for (name, labels), value in sorted(self.counters.items())}
+            histograms = {}
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                count = histogram['count']
+                target = 0.95 * count
+                cumulative = 0
+                p95 = float('inf')
+                for bound, value in zip(BUCKETS + (float('inf'),), histogram['buckets']):
+                    cumulative += value
+                    if cumulative >= target:
+                        p95 = bound
+                        break
+                histograms[label(name, labels)] = {
+                    'count': count,
+                    'sum': round(histogram['sum'], 6),
+                    'promedio': round(histogram['sum'] / count, 6) if count else 0,
+                    'p95_max': p95 if p95 != float('inf') else None,
+                }
+        return {'contadores': counters, 'latencias': histograms}
+
+    def write_prometheus(self, path, prefix='anid_'):
+        """
+        Escribe las métricas en el formato de texto de Prometheus con un rename atómico.
+
+        Args:
+            path (str): Archivo de salida (por ejemplo, en el directorio del textfile collector)
+            prefix (str): Prefijo de los nombres de las métricas
+        """
+        def labels_text(labels, extra=()):
+            items = []
+            for key, value in tuple(labels) + tuple(extra):
+                value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', ' ')
+                items.append(f'{key}="{value}"')
+            return '{' + ','.join(items) + '}' if items else ''
+
+        lines = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items())
+        seen = set()
+        for (name, labels), value in counters:
+            metric = f'{prefix}{name}_total'
+            if metric not in seen:
+                lines.append(f'# TYPE {metric} counter')
+                seen.add(metric)
+            lines.append(f'{metric}{labels_text(labels)} {value}')
+        for (name, labels), histogram in histograms:
+            metric = f'{prefix}{name}_segundos'
+            if metric not in seen:
+                lines.append(f'# TYPE {metric} histogram')
+                seen.add(metric)
+            cumulative = 0
+            for bound, value in zip(BUCKETS, histogram['buckets']):
+                cumulative += value
+                lines.append(f'{metric}_bucket{labels_text(labels, [("le", bound)])} {cumulative}')
+            lines.append(f'{metric}_bucket{labels_text(labels, [("le", "+Inf")])} {histogram["count"]}')
+            lines.append(f'{metric}_sum{labels_text(labels)} {histogram["sum"]}')
+            lines.append(f'{metric}_count{labels_text(labels)} {histogram["count"]}')
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(path + '.tmp', path)
+
+    def close(self):
+        """Cierra el archivo de log."""
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+
+# Registro compartido por todo el scraper (desactivado hasta que se configure)
+metrics = Metrics()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Escritura de los archivos de salida del ANID Scraper.
+
+Los CSV y los archivos columnares se exportan desde la base de datos
+recorriendo los registros sin cargarlos en memoria. Cada archivo se escribe en
+un archivo temporal que reemplaza al definitivo con un rename atómico, de modo
+que una interrupción nunca deja un archivo de salida a medio escribir.
+"""
+
+import csv
+import os
+from datetime import datetime
+from itertools import islice
+
+from anid_metrics import metrics
+
+
+def write_csv(path, columns, rows):
+    """
+    Escribe un CSV en un archivo temporal y lo mueve a su ruta definitiva con un rename atómico.
+
+    Args:
+        path (str): Ruta del CSV
+        columns (list): Columnas del CSV
+        rows (iterable): Registros con las columnas del CSV como llaves (las
+            columnas faltantes quedan vacías y las adicionales se ignoran)
+
+    Returns:
+        int: Número de registros escritos
+    """
+    tmp_path = path + '.tmp'
+    total = 0
+    with metrics.span('escritura_csv', labels={'archivo': os.path.basename(path)}) as span:
+        try:
+            with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=columns, restval='',
+                                        extrasaction='ignore', lineterminator=os.linesep)
+                writer.writeheader()
+                for row in rows:
+                    writer.writerow(row)
+                    total += 1
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        span.set(filas=total)
+    return total
+
+
+def iter_csv_rows(path):
+    """
+    Recorre las filas de un CSV sin cargarlo completo en memoria.
+
+    Args:
+        path (str): Ruta del CSV
+
+    Yields:
+        dict: Cada fila del archivo
+    """
+    with open(path, encoding='utf-8', newline='') as f:
+        yield from csv.DictReader(f)
+
+
+COLUMNAS_FECHA = ['INICIO', 'CIERRE', 'FALLO']
+COLUMNAS_CATEGORIA = ['ESTADO', 'TIPO']
+
+
+def _columnar_schema(columns):
+    # Esquema Arrow de las salidas columnares
+    import pyarrow as pa
+
+    fields = [pa.field('UID', pa.int64())]
+    for column in columns:
+        if column == 'ID':
+            fields.append(pa.field(column, pa.int64()))
+        elif column in COLUMNAS_FECHA or column == 'FECHA_EXTRACCION':
+            fields.append(pa.field(column, pa.timestamp('us')))
+        elif column in COLUMNAS_CATEGORIA:
+            fields.append(pa.field(column, pa.dictionary(pa.int32(), pa.string())))
+        else:
+            fields.append(pa.field(column, pa.string()))
+    fields.extend(pa.field(column + '_TEXTO', pa.string()) for column in COLUMNAS_FECHA if column in columns)
+    return pa.schema(fields)
+
+
+def _fecha_extraccion(record):
+    # FECHA_EXTRACCION como datetime (ConcursoRecord ya la guarda así)
+    if hasattr(record, 'fecha'):
+        return record.fecha('FECHA_EXTRACCION')
+    try:
+        return datetime.strptime(record.get('FECHA_EXTRACCION') or '', '%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        return None
+
+
+def _columnar_batch(chunk, columns, schema, dictionaries):
+    # Convierte un bloque de registros a un RecordBatch de Arrow, columna por
+    # columna. Las categorías se codifican con un diccionario que sólo crece
+    # entre bloques (dictionaries guarda el índice de cada valor por columna),
+    # de modo que cada bloque del Feather agrega un delta al diccionario anterior
+    import pyarrow as pa
+    from anid_parser import concurso_uid, parse_fecha
+
+    arrays = [pa.array([concurso_uid(record['URL']) for record in chunk], pa.int64())]
+    for column in columns:
+        if column == 'ID':
+            values = [record.get('ID') for record in chunk]
+            arrays.append(pa.array([int(value) if value not in (None, '') else None for value in values],
+                                   pa.int64()))
+        elif column == 'FECHA_EXTRACCION':
+            arrays.append(pa.array([_fecha_extraccion(record) for record in chunk], pa.timestamp('us')))
+        elif column in COLUMNAS_FECHA:
+            arrays.append(pa.array([parse_fecha(record.get(column)) for record in chunk], pa.timestamp('us')))
+        elif column in COLUMNAS_CATEGORIA:
+            index = dictionaries.setdefault(column, {})
+            codes = [index.setdefault(record.get(column) or '', len(index)) for record in chunk]
+            arrays.append(pa.DictionaryArray.from_arrays(pa.array(codes, pa.int32()),
+                                                         pa.array(list(index), pa.string())))
+        else:
+            arrays.append(pa.array([record.get(column) or '' for record in chunk], pa.string()))
+    for column in COLUMNAS_FECHA:
+        if column in columns:
+            arrays.append(pa.array([record.get(column) or '' for record in chunk], pa.string()))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def export_columnar(records, columns, parquet_path=None, feather_path=None, chunksize=1000):
+    """
+    Exporta los registros detallados a Parquet y/o Feather con columnas tipadas.
+
+    INICIO, CIERRE, FALLO y FECHA_EXTRACCION se guardan como fechas (el texto
+    original de las primeras se conserva en INICIO_TEXTO, CIERRE_TEXTO y
+    FALLO_TEXTO), ESTADO y TIPO como categorías y se agrega la columna UID, un
+    identificador estable derivado de la URL. Los registros se convierten a
+    columnas de Arrow por bloques, sin pasar por DataFrames, y cada bloque se
+    agrega a ambos archivos, por lo que la memoria usada depende de chunksize y
+    no del número de registros.
+
+    Requiere pyarrow (pip install pyarrow).
+
+    Args:
+        records (iterable): Registros (dict o ConcursoRecord), por ejemplo
+            ConcursoStore.iter_details()
+        columns (list): Columnas a exportar (las del CSV detallado)
+        parquet_path (str): Ruta del archivo Parquet a generar (opcional)
+        feather_path (str): Ruta del archivo Feather a generar (opcional)
+        chunksize (int): Registros por bloque
+
+    Returns:
+        int: Número de filas exportadas
+    """
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+
+    schema = _columnar_schema(columns)
+    paths = [path for path in (parquet_path, feather_path) if path]
+    writers = []
+    rows = 0
+    records = iter(records)
+    dictionaries = {}
+    try:
+        if parquet_path:
+            writers.append(pq.ParquetWriter(parquet_path + '.tmp', schema))
+        if feather_path:
+            # Feather (versión 2) es el formato de archivo IPC de Arrow, con la
+            # misma compresión por defecto que pyarrow.feather.write_feather
+            options = ipc.IpcWriteOptions(compression='lz4' if pa.Codec.is_available('lz4') else None,
+                                          emit_dictionary_deltas=True)
+            writers.append(ipc.new_file(feather_path + '.tmp', schema, options=options))
+        while True:
+            chunk = list(islice(records, chunksize))
+            if not chunk:
+                break
+            batch = _columnar_batch(chunk, columns, schema, dictionaries)
+            for writer in writers:
+                writer.write_batch(batch)
+            rows += len(chunk)
+    finally:
+        for writer in writers:
+            writer.close()
+    for path in paths:
+        if rows:
+            os.replace(path + '.tmp', path)
+        else:
+            os.remove(path + '.tmp')
+    return rows
@@ -0,0 +1,327 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Extractor rápido de la página de detalle de un concurso de ANID.
+
+Produce exactamente el mismo registro que parse_concurso_details() de
+ANID_scraper.py, pero construye un único árbol lxml y usa consultas XPath
+precompiladas en lugar de recorrer el árbol de BeautifulSoup una vez por campo.
+Para que el texto coincida con el de BeautifulSoup se replican sus reglas:
+se ignoran los comentarios y el contenido de script/style/template/rt/rp, y
+los textos formados sólo por espacios ASCII se reducen a '\\n' o ' '.
+
+Sólo depende de lxml, de modo que puede importarse en procesos de parseo sin
+cargar el resto del scraper.
+"""
+
+import codecs
+import hashlib
+import re
+import threading
+from datetime import datetime
+from urllib.parse import urljoin
+
+from lxml import etree
+
+from anid_record import ConcursoRecord
+
+TABS = {
+    'PRESENTACIÓN': 'jet-tabs-content-1911',
+    'PÚBLICO OBJETIVO': 'jet-tabs-content-1912',
+    'BITÁCORA': 'jet-tabs-content-1913',
+    'RESULTADOS': 'jet-tabs-content-1914',
+    'DOCUMENTOS': 'jet-tabs-content-1915'
+}
+
+DATE_FIELDS = [('INICIO', 'Inicio:'), ('CIERRE', 'Cierre:'), ('FALLO', 'Fallo estimado:')]
+
+# Etiquetas cuyos textos BeautifulSoup guarda con una clase especial y que, por
+# lo tanto, no forman parte de .text de las etiquetas que las contienen
+_STRING_CONTAINERS = ('script', 'style', 'template', 'rt', 'rp')
+_PRESERVE_WHITESPACE = ('pre', 'textarea')
+_ASCII_SPACES = ' \n\t\x0c\r'
+
+
+# Los parsers de lxml serializan su uso entre hilos, por lo que cada hilo usa el suyo
+_local = threading.local()
+
+
+def _html_parser():
+    if not hasattr(_local, 'parser'):
+        _local.parser = etree.HTMLParser()
+    return _local.parser
+
+
+_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([\w.:-]+)', re.IGNORECASE)
+
+
+def _decode(html, encoding=None):
+    # Decodifica el HTML usando la codificación indicada, la declarada en la
+    # página o UTF-8, en ese orden
+    if encoding is None:
+        match = _CHARSET_RE.search(html[:4096])
+        encoding = match.group(1).decode('ascii') if match else 'utf-8'
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        encoding = 'utf-8'
+    return html.decode(encoding, errors='replace')
+
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+_is_container = ' or '.join(f'self::{tag}' for tag in _STRING_CONTAINERS)
+_is_preserve = ' or '.join(f'self::{tag}' for tag in _PRESERVE_WHITESPACE)
+
+_ESTADO_XPATH = etree.XPath(f"(//span[{_has_class('estado')}])[1]")
+_FECHAS_XPATH = etree.XPath(f"//div[{_has_class('jet-listing-dynamic-field__content')}]")
+_TIPO_XPATH = etree.XPath(f"(//p[{_has_class('elementor-heading-title')} and {_has_class('elementor-size-default')}])[1]")
+_NOMBRE_XPATH = etree.XPath(f"(//h1[{_has_class('elementor-heading-title')} and {_has_class('elementor-size-default')}])[1]")
+_TABS_XPATH = etree.XPath('//*[' + ' or '.join(f"@id='{tab_id}'" for tab_id in TABS.values()) + ']')
+
+# Textos de un elemento cuyo contenedor especial más cercano es $container,
+# tal como los considera BeautifulSoup (sólo para el caso poco común en que el
+# elemento está dentro de un contenedor especial o es uno de ellos)
+_CONTAINER_TEXT_XPATH = etree.XPath(f"descendant::text()[name(ancestor::*[{_is_container}][1]) = $container]")
+_ANCESTOR_CONTAINER_XPATH = etree.XPath(f"boolean(ancestor::*[{_is_container}])")
+_ANCESTOR_PRESERVE_XPATH = etree.XPath(f"boolean(ancestor-or-self::*[{_is_preserve}])")
+
+
+def element_text(element):
+    """
+    Retorna el texto de un elemento con la misma semántica que Tag.text de BeautifulSoup.
+
+    Args:
+        element (lxml.etree._Element): Elemento del que se extrae el texto
+
+    Returns:
+        str: Texto del elemento
+    """
+    if element.tag in _STRING_CONTAINERS or _ANCESTOR_CONTAINER_XPATH(element):
+        container = element.tag if element.tag in _STRING_CONTAINERS else ''
+        return ''.join(_bs4_string(text) for text in _CONTAINER_TEXT_XPATH(element, container=container))
+
+    parts = []
+    _collect_text(element, parts, _ANCESTOR_PRESERVE_XPATH(element))
+    return ''.join(parts)
+
+
+def _collect_text(element, parts, preserve):
+    # Recorre el subárbol en orden de documento agregando los textos visibles
+    # para BeautifulSoup; el contenido de comentarios y contenedores se omite
+    text = element.text
+    if text:
+        parts.append(text if preserve else _collapse(text))
+    for child in element:
+        tag = child.tag
+        if isinstance(tag, str) and tag not in _STRING_CONTAINERS:
+            _collect_text(child, parts, preserve or tag in _PRESERVE_WHITESPACE)
+        tail = child.tail
+        if tail:
+            parts.append(tail if preserve else _collapse(tail))
+
+
+def _collapse(text):
+    # BeautifulSoup reduce a '\n' o ' ' los textos formados sólo por espacios ASCII
+    if text.strip(_ASCII_SPACES):
+        return text
+    return '\n' if '\n' in text else ' '
+
+
+def _bs4_string(text):
+    owner = text.getparent() if text.is_text else text.getparent().getparent()
+    if owner is not None and _ANCESTOR_PRESERVE_XPATH(owner):
+        return str(text)
+    return _collapse(text)
+
+
+def _bs4_children(element):
+    # Hijos del elemento en el orden de Tag.contents (textos, etiquetas y comentarios)
+    if element.text:
+        yield element.text
+    for child in element:
+        yield child
+        if child.tail:
+            yield child.tail
+
+
+def _bs4_string_property(element):
+    # Equivalente a Tag.string: el único hijo de texto, o recursivamente el de
+    # la única etiqueta hija; None si hay más de un hijo (los espacios no se
+    # reducen, ya que sólo se usa para buscar la etiqueta de la fecha)
+    while True:
+        children = list(_bs4_children(element))
+        if len(children) != 1:
+            return None
+        child = children[0]
+        if isinstance(child, str):
+            return child
+        if not isinstance(child.tag, str):
+            # Comentario o instrucción de procesamiento
+            return child.text
+        element = child
+
+
+def document_urls(hrefs, base_url):
+    """
+    Normaliza los enlaces de la pestaña DOCUMENTOS.
+
+    Args:
+        hrefs (iterable): Atributos href de los enlaces, en orden de documento
+        base_url (str): URL del concurso, usada para resolver los enlaces relativos
+
+    Returns:
+        str: URLs absolutas (sin fragmento y sin repetir) separadas por saltos de línea
+    """
+    urls = []
+    for href in hrefs:
+        href = href.strip()
+        if not href or href.startswith(('#', 'mailto:', 'tel:', 'javascript:')):
+            continue
+        absolute = urljoin(base_url, href).split('#')[0]
+        if absolute not in urls:
+            urls.append(absolute)
+    return '\n'.join(urls)
+
+
+def _first(xpath, root):
+    result = xpath(root)
+    return result[0] if result else None
+
+
+def extract_concurso_record(html, url, fecha_extraccion=None, encoding=None):
+    """
+    Extrae la información detallada de un concurso a partir de su HTML.
+
+    Args:
+        html (str o bytes): HTML de la página del concurso
+        url (str): URL del concurso
+        fecha_extraccion (str): Valor de FECHA_EXTRACCION (por defecto, la hora actual)
+        encoding (str): Codificación de html si son bytes (por defecto, la declarada
+            en la página o UTF-8)
+
+    Returns:
+        ConcursoRecord: Registro con la información detallada del concurso, con las
+            mismas llaves y valores que el diccionario de parse_concurso_details()
+    """
+    if isinstance(html, bytes):
+        html = _decode(html, encoding)
+    root = etree.fromstring(html, _html_parser()) if html else None
+    if root is None:
+        # Documento vacío
+        root = etree.Element('html')
+
+    details = {
+        'URL': url,
+        'FECHA_EXTRACCION': fecha_extraccion or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+    # Extraer información básica
+    estado = _first(_ESTADO_XPATH, root)
+    details['ESTADO'] = element_text(estado).strip() if estado is not None else ''
+
+    # Extraer fechas: sólo se consideran los campos cuyo texto único contiene la etiqueta
+    dates = {}
+    for element in _FECHAS_XPATH(root):
+        string = str(_bs4_string_property(element))
+        for field, text in DATE_FIELDS:
+            if field not in dates and text in string:
+                dates[field] = element_text(element).split(text)[1].strip()
+    for field, _ in DATE_FIELDS:
+        details[field] = dates.get(field, '')
+
+    # Extraer tipo y nombre
+    tipo = _first(_TIPO_XPATH, root)
+    details['TIPO'] = element_text(tipo).strip() if tipo is not None else ''
+
+    nombre = _first(_NOMBRE_XPATH, root)
+    details['NOMBRE'] = element_text(nombre).strip() if nombre is not None else ''
+
+    # Extraer contenido de las pestañas
+    contents = {}
+    for element in _TABS_XPATH(root):
+        contents.setdefault(element.get('id'), element)
+    for tab_name, tab_id in TABS.items():
+        content = contents.get(tab_id)
+        if content is not None:
+            text = element_text(content).strip()
+            if tab_name == 'PRESENTACIÓN':
+                # Eliminar la línea de consultas
+                text = text.split('Dirija sus consultas')[0].strip()
+            details[tab_name] = text
+        else:
+            details[tab_name] = ''
+
+    # Conservar los enlaces a los documentos (bases, anexos, etc.)
+    documentos = contents.get(TABS['DOCUMENTOS'])
+    details['DOCUMENTOS_URLS'] = document_urls(
+        (a.get('href') for a in documentos.iter('a') if a.get('href') is not None), url
+    ) if documentos is not None else ''
+
+    return ConcursoRecord(details)
+
+
+MESES = {
+    'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4, 'mayo': 5, 'junio': 6,
+    'julio': 7, 'agosto': 8, 'septiembre': 9, 'setiembre': 9, 'octubre': 10,
+    'noviembre': 11, 'diciembre': 12
+}
+
+_FECHA_TEXTO_RE = re.compile(
+    r'(?:(?P<dia>\d{1,2})\s+(?:de\s+)?)?\b(?P<mes>' + '|'.join(MESES) + r')\.?,?\s+(?:de(?:l)?\s+)?(?P<anio>\d{4})',
+    re.IGNORECASE
+)
+_FECHA_NUMERICA_RE = re.compile(r'(?P<dia>\d{1,2})[/.-](?P<mes>\d{1,2})[/.-](?P<anio>\d{4})')
+_FECHA_ISO_RE = re.compile(r'(?P<anio>\d{4})-(?P<mes>\d{1,2})-(?P<dia>\d{1,2})')
+_HORA_RE = re.compile(r'(?P<hora>\d{1,2})[:.](?P<minuto>\d{2})')
+
+
+def parse_fecha(text):
+    """
+    Convierte una fecha de la página de un concurso a datetime.
+
+    Reconoce los formatos usados en anid.cl, por ejemplo "10 de mayo, 2023",
+    "10 de mayo de 2023 17:00", "10/05/2023" o "agosto 2023" (primer día del mes).
+
+    Args:
+        text (str): Texto de la fecha (INICIO, CIERRE o FALLO)
+
+    Returns:
+        datetime: Fecha (con hora si el texto la incluye) o None si no se reconoce
+    """
+    if not text:
+        return None
+    text = text.strip().lower()
+    match = _FECHA_TEXTO_RE.search(text) or _FECHA_NUMERICA_RE.search(text) or _FECHA_ISO_RE.search(text)
+    if not match:
+        return None
+    mes = match.group('mes')
+    mes = MESES[mes] if mes in MESES else int(mes)
+    dia = int(match.group('dia')) if match.group('dia') else 1
+    hora = _HORA_RE.search(text, match.end())
+    try:
+        if hora:
+            return datetime(int(match.group('anio')), mes, dia, int(hora.group('hora')), int(hora.group('minuto')))
+        return datetime(int(match.group('anio')), mes, dia)
+    except ValueError:
+        return None
+
+
+def concurso_uid(url):
+    """
+    Retorna un identificador numérico estable para un concurso.
+
+    A diferencia de la columna ID, que es la clave asignada por la base de
+    datos SQLite al registrar cada URL, este identificador depende sólo de la
+    URL, por lo que coincide entre bases de datos distintas.
+
+    Args:
+        url (str): URL del concurso
+
+    Returns:
+        int: Entero de 64 bits con signo derivado de la URL
+    """
+    digest = hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
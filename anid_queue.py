@@ -0,0 +1,305 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Cola de trabajo compartida para repartir la extracción entre varios procesos.
+
+Un coordinador encola las URLs a extraer y cada trabajador (en el mismo equipo
+o en otro con acceso a la cola) toma un lote con una concesión (lease) de
+duración limitada, descarga los concursos y reporta cada resultado. Si un
+trabajador se cae, sus concesiones vencen y las URLs vuelven a quedar
+disponibles para los demás; una URL que agota sus intentos queda como fallida.
+El coordinador recoge los resultados y los guarda en la base de datos.
+
+El backend incluido usa SQLite (los bloqueos de archivo de SQLite serializan
+la asignación de tareas entre procesos). Otros backends implementan la
+interfaz de WorkQueue y se registran en BACKENDS.
+"""
+
+import json
+import sqlite3
+from abc import ABC, abstractmethod
+import threading
+import time
+
+# Estados de una tarea
+PENDIENTE = 'pendiente'
+ASIGNADA = 'asignada'
+HECHA = 'hecha'
+FALLIDA = 'fallida'
+
+
+class WorkQueue(ABC):
+    """
+    Interfaz de una cola de trabajo con concesiones.
+
+    Todos los métodos deben ser seguros entre procesos: dos trabajadores nunca
+    reciben la misma URL mientras la concesión de uno de ellos esté vigente. Un
+    backend que no implementa todos los métodos abstractos falla al crearse.
+    """
+
+    @abstractmethod
+    def put(self, urls):
+        """
+        Encola URLs, en orden de prioridad (la primera es la más prioritaria).
+
+        Las URLs pendientes o asignadas no se duplican; las ya terminadas cuyo
+        resultado se recogió vuelven a quedar pendientes.
+
+        Args:
+            urls (iterable): URLs a extraer
+
+        Returns:
+            int: Número de URLs encoladas
+        """
+
+    @abstractmethod
+    def lease(self, worker, count):
+        """
+        Asigna hasta count URLs pendientes a un trabajador, recuperando antes las
+        concesiones vencidas.
+
+        Args:
+            worker (str): Identificador del trabajador
+            count (int): Máximo de URLs a asignar
+
+        Returns:
+            list: URLs asignadas (vacía si no hay pendientes)
+        """
+
+    @abstractmethod
+    def renew(self, worker, urls):
+        """
+        Extiende las concesiones vigentes de un trabajador.
+
+        Args:
+            worker (str): Identificador del trabajador
+            urls (iterable): URLs cuya concesión se extiende
+        """
+
+    @abstractmethod
+    def complete(self, worker, url, record):
+        """
+        Registra el resultado de una URL.
+
+        Args:
+            worker (str): Identificador del trabajador
+            url (str): URL del concurso
+            record (dict): Registro extraído
+
+        Returns:
+            bool: False si la URL ya tenía un resultado (de otro trabajador)
+        """
+
+    @abstractmethod
+    def fail(self, worker, url, error=None):
+        """
+        Registra que la extracción de una URL falló; vuelve a quedar pendiente
+        mientras le queden intentos.
+
+        Args:
+            worker (str): Identificador del trabajador
+            url (str): URL del concurso
+            error (str): Descripción del error
+        """
+
+    @abstractmethod
+    def results(self, limit=500):
+        """
+        Retorna resultados que el coordinador aún no ha recogido.
+
+        Args:
+            limit (int): Máximo de resultados
+
+        Returns:
+            list: Tuplas (url, record)
+        """
+
+    @abstractmethod
+    def acknowledge(self, urls):
+        """
+        Marca resultados como recogidos (después de guardarlos).
+
+        Args:
+            urls (iterable): URLs de los resultados recogidos
+        """
+
+    @abstractmethod
+    def stats(self):
+        """
+        Returns:
+            dict: Número de tareas por estado y resultados sin recoger
+        """
+
+    def close(self):
+        """Libera los recursos de la cola."""
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """
+    Cola de trabajo en un archivo SQLite compartido por los procesos.
+    """
+
+    def __init__(self, path, lease_seconds=300, max_attempts=3):
+        """
+        Args:
+            path (str): Ruta del archivo SQLite de la cola
+            lease_seconds (float): Duración de una concesión sin renovar
+            max_attempts (int): Asignaciones de una URL antes de marcarla como fallida
+        """
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        # Sin transacciones implícitas: las que escriben usan BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tareas (
+                url TEXT PRIMARY KEY,
+                estado TEXT NOT NULL,
+                prioridad INTEGER NOT NULL,
+                intentos INTEGER NOT NULL DEFAULT 0,
+                trabajador TEXT,
+                vence REAL,
+                resultado TEXT,
+                recogida INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                actualizada REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS tareas_estado ON tareas (estado, prioridad);
+            CREATE INDEX IF NOT EXISTS tareas_recogida ON tareas (estado, recogida);
+        """)
+
+    def _write(self, function):
+        # Ejecuta function(cursor) en una transacción que toma el bloqueo de
+        # escritura desde el inicio, de modo que dos procesos no leen las mismas
+        # tareas pendientes antes de asignarlas
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = function(self._conn)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return result
+
+    def put(self, urls):
+        now = time.time()
+
+        def put(conn):
+            last = conn.execute("SELECT COALESCE(MAX(prioridad), 0) FROM tareas").fetchone()[0]
+            added = 0
+            for position, url in enumerate(urls, start=last + 1):
+                cursor = conn.execute("""
+                    INSERT INTO tareas (url, estado, prioridad, actualizada) VALUES (?, ?, ?, ?)
+                    ON CONFLICT(url) DO UPDATE SET
+                        estado = excluded.estado, prioridad = excluded.prioridad, intentos = 0,
+                        trabajador = NULL, vence = NULL, resultado = NULL, recogida = 0, error = NULL,
+                        actualizada = excluded.actualizada
+                    WHERE estado = ? OR (estado = ? AND recogida = 1)
+                """, (url, PENDIENTE, position, now, FALLIDA, HECHA))
+                added += cursor.rowcount
+            return added
+
+        return self._write(put)
+
+    def _reclaim(self, conn, now):
+        # Las concesiones vencidas vuelven a quedar pendientes, o fallidas si
+        # la URL agotó sus intentos (por ejemplo, si hace caer al trabajador)
+        conn.execute("""
+            UPDATE tareas SET estado = CASE WHEN intentos >= ? THEN ? ELSE ? END,
+                trabajador = NULL, vence = NULL, error = 'concesión vencida', actualizada = ?
+            WHERE estado = ? AND vence < ?
+        """, (self.max_attempts, FALLIDA, PENDIENTE, now, ASIGNADA, now))
+
+    def lease(self, worker, count):
+        now = time.time()
+
+        def lease(conn):
+            self._reclaim(conn, now)
+            urls = [url for url, in conn.execute(
+                "SELECT url FROM tareas WHERE estado = ? ORDER BY prioridad LIMIT ?", (PENDIENTE, count)
+            )]
+            conn.executemany("""
+                UPDATE tareas SET estado = ?, trabajador = ?, vence = ?, intentos = intentos + 1, actualizada = ?
+                WHERE url = ?
+            """, [(ASIGNADA, worker, now + self.lease_seconds, now, url) for url in urls])
+            return urls
+
+        return self._write(lease)
+
+    def renew(self, worker, urls):
+        now = time.time()
+        self._write(lambda conn: conn.executemany(
+            "UPDATE tareas SET vence = ? WHERE url = ? AND estado = ? AND trabajador = ?",
+            [(now + self.lease_seconds, url, ASIGNADA, worker) for url in urls]
+        ))
+
+    def complete(self, worker, url, record):
+        # Se acepta el primer resultado aunque la concesión haya vencido
+        data = json.dumps(dict(record), ensure_ascii=False)
+        return self._write(lambda conn: conn.execute("""
+            UPDATE tareas SET estado = ?, trabajador = ?, vence = NULL, resultado = ?, recogida = 0,
+                error = NULL, actualizada = ?
+            WHERE url = ? AND estado IN (?, ?)
+        """, (HECHA, worker, data, time.time(), url, PENDIENTE, ASIGNADA)).rowcount > 0)
+
+    def fail(self, worker, url, error=None):
+        self._write(lambda conn: conn.execute("""
+            UPDATE tareas SET estado = CASE WHEN intentos >= ? THEN ? ELSE ? END,
+                trabajador = NULL, vence = NULL, error = ?, actualizada = ?
+            WHERE url = ? AND estado = ? AND trabajador = ?
+        """, (self.max_attempts, FALLIDA, PENDIENTE, error, time.time(), url, ASIGNADA, worker)))
+
+    def results(self, limit=500):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, resultado FROM tareas WHERE estado = ? AND recogida = 0 LIMIT ?", (HECHA, limit)
+            ).fetchall()
+        return [(url, json.loads(data)) for url, data in rows]
+
+    def acknowledge(self, urls):
+        self._write(lambda conn: conn.executemany(
+            "UPDATE tareas SET recogida = 1, resultado = NULL WHERE url = ? AND estado = ?",
+            [(url, HECHA) for url in urls]
+        ))
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT estado, COUNT(*) FROM tareas GROUP BY estado"))
+            uncollected = self._conn.execute(
+                "SELECT COUNT(*) FROM tareas WHERE estado = ? AND recogida = 0", (HECHA,)
+            ).fetchone()[0]
+        stats = {state: counts.get(state, 0) for state in (PENDIENTE, ASIGNADA, HECHA, FALLIDA)}
+        stats['sin_recoger'] = uncollected
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# Backends disponibles, según el prefijo de la ubicación de la cola
+BACKENDS = {
+    'sqlite': SQLiteWorkQueue,
+}
+
+
+def open_queue(location, **options):
+    """
+    Abre una cola de trabajo.
+
+    Args:
+        location (str): Ruta del archivo de la cola, opcionalmente con el
+            backend como prefijo ('sqlite:ANID_cola.sqlite'); sin prefijo se usa SQLite
+        **options: Opciones del backend (por ejemplo lease_seconds)
+
+    Returns:
+        WorkQueue: Cola de trabajo
+    """
+    backend, separator, path = location.partition(':')
+    # Una ruta sin prefijo (o con letra de unidad en Windows) usa SQLite
+    if not separator or backend not in BACKENDS:
+        backend, path = 'sqlite', location
+    return BACKENDS[backend](path, **options)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Registro compacto de un concurso de ANID.
+
+Un dict por concurso guarda sus 15 llaves en una tabla de hash propia y cada
+registro repite el texto de ESTADO, TIPO y FECHA_EXTRACCION. ConcursoRecord
+guarda los campos en __slots__, comparte un único objeto por cada valor
+distinto de ESTADO y TIPO (que toman pocos valores, como un enum) y guarda
+FECHA_EXTRACCION como datetime. Se comporta como un diccionario con las
+columnas del CSV detallado como llaves, de modo que puede usarse en lugar de
+los registros dict en todo el scraper.
+"""
+
+import sys
+from collections.abc import MutableMapping
+from datetime import datetime
+
+# Columnas del CSV detallado y el atributo de ConcursoRecord (y columna de la
+# base de datos) en que se guarda cada una
+CAMPOS = {
+    'ID': 'id',
+    'URL': 'url',
+    'ESTADO': 'estado',
+    'NOMBRE': 'nombre',
+    'TIPO': 'tipo',
+    'INICIO': 'inicio',
+    'CIERRE': 'cierre',
+    'FALLO': 'fallo',
+    'PRESENTACIÓN': 'presentacion',
+    'PÚBLICO OBJETIVO': 'publico_objetivo',
+    'BITÁCORA': 'bitacora',
+    'RESULTADOS': 'resultados',
+    'DOCUMENTOS': 'documentos',
+    'DOCUMENTOS_URLS': 'documentos_urls',
+    'FECHA_EXTRACCION': 'fecha_extraccion',
+}
+
+# Campos con pocos valores distintos, que se comparten entre registros
+CAMPOS_CATEGORIA = ('estado', 'tipo')
+
+FORMATO_FECHA_EXTRACCION = '%Y-%m-%d %H:%M:%S'
+
+
+class ConcursoRecord(MutableMapping):
+    """
+    Registro de un concurso con las columnas del CSV detallado como llaves.
+
+    Los campos sin valor (None) no forman parte de las llaves, igual que en un
+    dict al que no se le asignó la llave. FECHA_EXTRACCION se entrega como texto
+    en el formato '%Y-%m-%d %H:%M:%S'; fecha() la entrega como datetime.
+    """
+
+    __slots__ = tuple(CAMPOS.values())
+
+    def __init__(self, values=(), **fields):
+        """
+        Args:
+            values (dict o iterable): Campos iniciales, con las columnas del CSV como llaves
+            **fields: Campos adicionales, con el nombre del atributo como llave
+                (por ejemplo, fecha_extraccion=datetime.now())
+        """
+        for attribute in self.__slots__:
+            setattr(self, attribute, None)
+        self.update(values)
+        for attribute, value in fields.items():
+            self._set(attribute, value)
+
+    def _set(self, attribute, value):
+        if value is not None:
+            if attribute in CAMPOS_CATEGORIA:
+                value = sys.intern(value)
+            elif attribute == 'fecha_extraccion' and isinstance(value, str):
+                # Un texto en otro formato se conserva tal cual
+                try:
+                    value = datetime.strptime(value, FORMATO_FECHA_EXTRACCION)
+                except ValueError:
+                    pass
+        setattr(self, attribute, value)
+
+    def __getitem__(self, key):
+        attribute = CAMPOS.get(key)
+        value = getattr(self, attribute) if attribute else None
+        if value is None:
+            raise KeyError(key)
+        if attribute == 'fecha_extraccion' and isinstance(value, datetime):
+            return value.strftime(FORMATO_FECHA_EXTRACCION)
+        return value
+
+    def __setitem__(self, key, value):
+        attribute = CAMPOS.get(key)
+        if attribute is None:
+            raise KeyError(key)
+        self._set(attribute, value)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        setattr(self, CAMPOS[key], None)
+
+    def __iter__(self):
+        for column, attribute in CAMPOS.items():
+            if getattr(self, attribute) is not None:
+                yield column
+
+    def __len__(self):
+        return sum(1 for attribute in self.__slots__ if getattr(self, attribute) is not None)
+
+    def __contains__(self, key):
+        attribute = CAMPOS.get(key)
+        return attribute is not None and getattr(self, attribute) is not None
+
+    def __getstate__(self):
+        # Los registros se envían entre procesos (pool de parseo) con pickle
+        return tuple(getattr(self, attribute) for attribute in self.__slots__)
+
+    def __setstate__(self, state):
+        for attribute, value in zip(self.__slots__, state):
+            self._set(attribute, value)
+
+    def __repr__(self):
+        return f'ConcursoRecord({self.url!r}, estado={self.estado!r})'
+
+    def fecha(self, column):
+        """
+        Retorna una fecha del concurso como datetime.
+
+        Args:
+            column (str): 'FECHA_EXTRACCION', 'INICIO', 'CIERRE' o 'FALLO'
+
+        Returns:
+            datetime: Fecha o None si el campo está vacío o no se reconoce
+        """
+        if column == 'FECHA_EXTRACCION':
+            return self.fecha_extraccion if isinstance(self.fecha_extraccion, datetime) else None
+        from anid_parser import parse_fecha
+
+        return parse_fecha(self.get(column))
+
+    @classmethod
+    def from_row(cls, row, columns):
+        """
+        Construye un registro a partir de una fila de la base de datos.
+
+        Args:
+            row (tuple): Valores de la fila
+            columns (list): Atributo de cada valor de la fila
+
+        Returns:
+            ConcursoRecord: Registro
+        """
+        return cls(**dict(zip(columns, row)))
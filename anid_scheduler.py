@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Planificador de actualizaciones de los concursos de ANID.
+
+Asigna a cada concurso un intervalo de actualización según su ESTADO, sus fechas
+de CIERRE y FALLO y la fecha de su último cambio: un concurso abierto que cierra
+mañana se actualiza cada hora, mientras que uno cerrado hace años casi nunca. La
+prioridad de un concurso es el tiempo transcurrido desde su última extracción
+dividido por su intervalo; en cada ejecución se extraen primero los concursos
+más atrasados, hasta agotar el presupuesto de peticiones.
+"""
+
+import heapq
+from datetime import datetime
+
+from anid_parser import parse_fecha
+
+HORA = 3600
+DIA = 24 * HORA
+
+# Intervalos de actualización (en segundos)
+INTERVALO_CIERRE_INMINENTE = HORA        # abierto, cierra en menos de 2 días
+INTERVALO_CIERRE_CERCANO = 6 * HORA      # abierto, cierra en menos de 14 días
+INTERVALO_ABIERTO = DIA
+INTERVALO_PROXIMAMENTE = 12 * HORA
+INTERVALO_FALLO_CERCANO = 6 * HORA       # en evaluación, fallo en menos de 7 días
+INTERVALO_EN_EVALUACION = 2 * DIA
+INTERVALO_SIN_FECHAS = 30 * DIA
+INTERVALO_MINIMO_CERRADO = DIA
+INTERVALO_MAXIMO_CERRADO = 365 * DIA
+
+# Un concurso cerrado se actualiza cada FRACCION_ANTIGUEDAD de su antigüedad
+# (desde su última fecha conocida), entre los intervalos mínimo y máximo
+FRACCION_ANTIGUEDAD = 0.25
+
+# Los concursos que cambiaron hace poco se actualizan con el doble de frecuencia
+VENTANA_CAMBIO_RECIENTE = 7 * DIA
+
+
+def _parse_timestamp(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+    except (TypeError, ValueError):
+        return None
+
+
+def refresh_interval(candidate, now, estados_mutables):
+    """
+    Calcula cada cuánto debe actualizarse un concurso.
+
+    Args:
+        candidate (dict): Concurso con las llaves estado, cierre, fallo y ultimo_cambio
+        now (datetime): Fecha actual
+        estados_mutables (set): Estados (en minúsculas) en que el concurso todavía puede cambiar
+
+    Returns:
+        float: Intervalo en segundos
+    """
+    estado = (candidate['estado'] or '').strip().lower()
+    cierre = parse_fecha(candidate['cierre'])
+    fallo = parse_fecha(candidate['fallo'])
+    ultimo_cambio = _parse_timestamp(candidate['ultimo_cambio'])
+
+    if estado == 'abierto':
+        if cierre is None:
+            interval = INTERVALO_ABIERTO
+        elif (cierre - now).total_seconds() < 2 * DIA:
+            # Incluye los concursos cuyo cierre ya pasó pero siguen abiertos
+            interval = INTERVALO_CIERRE_INMINENTE
+        elif (cierre - now).total_seconds() < 14 * DIA:
+            interval = INTERVALO_CIERRE_CERCANO
+        else:
+            interval = INTERVALO_ABIERTO
+    elif estado in ('próximamente', 'proximamente'):
+        interval = INTERVALO_PROXIMAMENTE
+    elif estado in estados_mutables:
+        if fallo is not None and (fallo - now).total_seconds() < 7 * DIA:
+            interval = INTERVALO_FALLO_CERCANO
+        else:
+            interval = INTERVALO_EN_EVALUACION
+    else:
+        # Estado final (cerrado, fallado, desierto...): cuanto más antiguo, menos frecuente
+        known = [fecha for fecha in (cierre, fallo, ultimo_cambio) if fecha is not None and fecha <= now]
+        if not known:
+            interval = INTERVALO_SIN_FECHAS
+        else:
+            age = (now - max(known)).total_seconds()
+            interval = min(max(age * FRACCION_ANTIGUEDAD, INTERVALO_MINIMO_CERRADO), INTERVALO_MAXIMO_CERRADO)
+
+    if ultimo_cambio is not None and (now - ultimo_cambio).total_seconds() < VENTANA_CAMBIO_RECIENTE:
+        interval /= 2
+    return interval
+
+
+def refresh_priority(candidate, now, estados_mutables):
+    """
+    Calcula la prioridad de actualización de un concurso.
+
+    Args:
+        candidate (dict): Concurso con las llaves estado, cierre, fallo,
+            fecha_extraccion y ultimo_cambio
+        now (datetime): Fecha actual
+        estados_mutables (set): Estados (en minúsculas) en que el concurso todavía puede cambiar
+
+    Returns:
+        float: Tiempo desde la última extracción dividido por el intervalo de
+            actualización (>= 1 si la actualización está vencida); infinito si el
+            concurso nunca se ha extraído o no se pudo obtener su ESTADO
+    """
+    extracted = _parse_timestamp(candidate['fecha_extraccion'])
+    if not candidate['estado'] or extracted is None:
+        return float('inf')
+    elapsed = (now - extracted).total_seconds()
+    return elapsed / refresh_interval(candidate, now, estados_mutables)
+
+
+def plan_refresh(candidates, estados_mutables, budget=None, now=None, fresh_urls=None):
+    """
+    Selecciona los concursos a actualizar en esta ejecución.
+
+    Los concursos ya extraídos cuya página sigue vigente en el caché HTTP no se
+    seleccionan ni se cuentan como vencidos: su descarga no llegaría al servidor
+    ni actualizaría FECHA_EXTRACCION, de modo que sólo ocuparían el presupuesto.
+
+    Args:
+        candidates (iterable): Concursos retornados por ConcursoStore.refresh_candidates()
+        estados_mutables (set): Estados (en minúsculas) en que el concurso todavía puede cambiar
+        budget (int): Máximo de concursos a actualizar (None: todos los vencidos)
+        now (datetime): Fecha actual (por defecto, datetime.now())
+        fresh_urls (set): URLs vigentes en el caché HTTP (ver HttpCache.fresh_urls)
+
+    Returns:
+        tuple: (pending, due)
+            - pending (list): Tuplas (id, url) a actualizar, de mayor a menor prioridad
+            - due (int): Número total de concursos con la actualización vencida
+    """
+    now = now or datetime.now()
+    due = []
+    for candidate in candidates:
+        priority = refresh_priority(candidate, now, estados_mutables)
+        if fresh_urls and priority != float('inf') and candidate['url'] in fresh_urls:
+            continue
+        if priority >= 1:
+            # A igual prioridad, primero los concursos más recientes (ID mayor)
+            due.append((priority, candidate['id'], candidate['url']))
+    if budget is None or budget >= len(due):
+        selected = sorted(due, reverse=True)
+    else:
+        selected = heapq.nlargest(budget, due)
+    return [(concurso_id, url) for _, concurso_id, url in selected], len(due)
@@ -0,0 +1,577 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Almacenamiento de los concursos de ANID en una base de datos SQLite.
+
+Cada URL recibe un ID estable al registrarse por primera vez, la consulta
+"¿esta URL ya está registrada?" usa un índice y la información detallada se
+guarda con upserts transaccionales. Los archivos CSV se generan a partir de la
+base de datos como una exportación.
+
+Al actualizar un concurso se compara el hash de cada campo con el de la versión
+guardada y los campos que cambiaron se registran en la tabla cambios, de modo
+que "qué cambió desde T" es una consulta sobre un índice.
+
+El texto de las pestañas se indexa en una tabla FTS5 (tokenizador unicode61 sin
+distinción de mayúsculas ni tildes) que triggers mantienen actualizada con cada
+upsert, de modo que las búsquedas no recorren el texto de todos los concursos.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from anid_output import iter_csv_rows, write_csv
+from anid_record import CAMPOS, ConcursoRecord
+
+# Columnas del CSV detallado y su nombre en la tabla detalles
+COLUMNAS_DB = {column: name for column, name in CAMPOS.items() if column not in ('ID', 'URL')}
+
+# Campos indexados para la búsqueda de texto completo y su peso en el ranking
+CAMPOS_BUSQUEDA = {
+    'NOMBRE': 10.0,
+    'PRESENTACIÓN': 2.0,
+    'PÚBLICO OBJETIVO': 1.0,
+    'BITÁCORA': 1.0,
+    'RESULTADOS': 1.0,
+}
+
+# Operadores que indican que una consulta usa la sintaxis de FTS5 (otros
+# caracteres especiales, como ':' o '(', son frecuentes en los nombres)
+_FTS_OPERADORES = ('"', ' AND ', ' OR ', ' NOT ', 'NEAR(')
+
+# Campos cuyos cambios se registran en la tabla cambios
+CAMPOS_SEGUIDOS = [field for field in COLUMNAS_DB if field != 'FECHA_EXTRACCION']
+
+
+def field_hash(value):
+    """
+    Retorna el hash del valor de un campo, usado para detectar cambios.
+
+    Args:
+        value (str): Valor del campo (None equivale a '')
+
+    Returns:
+        str: Hash hexadecimal de 16 caracteres
+    """
+    return hashlib.blake2b((value or '').encode('utf-8'), digest_size=8).hexdigest()
+
+
+class ConcursoStore:
+    """
+    Base de datos SQLite con las URLs de los concursos y su información detallada.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Ruta del archivo SQLite
+        """
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        columns = ',\n'.join(f'{column} TEXT' for column in COLUMNAS_DB.values())
+        self._conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS concursos (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL UNIQUE,
+                primera_vez TEXT NOT NULL,
+                ultima_vez TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS detalles (
+                concurso_id INTEGER PRIMARY KEY REFERENCES concursos (id),
+                {columns}
+            );
+            CREATE INDEX IF NOT EXISTS detalles_estado ON detalles (estado);
+            -- URLs guardadas en la ejecución en curso, para retomarla si se interrumpe
+            CREATE TABLE IF NOT EXISTS progreso (
+                concurso_id INTEGER PRIMARY KEY REFERENCES concursos (id)
+            );
+            CREATE TABLE IF NOT EXISTS cambios (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                concurso_id INTEGER NOT NULL REFERENCES concursos (id),
+                campo TEXT NOT NULL,
+                hash_anterior TEXT NOT NULL,
+                hash_nuevo TEXT NOT NULL,
+                fecha TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS cambios_fecha ON cambios (fecha);
+            CREATE INDEX IF NOT EXISTS cambios_concurso ON cambios (concurso_id, fecha);
+            -- Concursos ya guardados por cada backfill, para retomarlo si se interrumpe
+            CREATE TABLE IF NOT EXISTS backfill (
+                trabajo TEXT NOT NULL,
+                concurso_id INTEGER NOT NULL REFERENCES concursos (id),
+                PRIMARY KEY (trabajo, concurso_id)
+            );
+            -- Una fila por recorrido del listado: hasta qué página se llegó y si fue completo
+            CREATE TABLE IF NOT EXISTS descubrimientos (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                fecha TEXT NOT NULL,
+                paginas INTEGER NOT NULL,
+                total_paginas INTEGER NOT NULL,
+                urls_nuevas INTEGER NOT NULL,
+                completo INTEGER NOT NULL
+            );
+        """)
+        # Agregar las columnas nuevas a las bases de datos creadas por versiones
+        # anteriores; los registros existentes quedan con NULL en ellas
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(detalles)")}
+        for column in COLUMNAS_DB.values():
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE detalles ADD COLUMN {column} TEXT")
+        self.search_enabled = self._create_search_index()
+        self._conn.commit()
+
+    def _create_search_index(self):
+        # Crea la tabla FTS5 sobre detalles y los triggers que la mantienen
+        # actualizada; retorna False si SQLite no tiene soporte para FTS5
+        columns = [COLUMNAS_DB[field] for field in CAMPOS_BUSQUEDA]
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'busqueda'"
+        ).fetchone()
+        try:
+            self._conn.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS busqueda USING fts5(
+                    {', '.join(columns)},
+                    content='detalles', content_rowid='concurso_id',
+                    tokenize='unicode61 remove_diacritics 2', prefix='3'
+                )
+            """)
+        except sqlite3.OperationalError:
+            return False
+        new_values = ', '.join(f'new.{column}' for column in columns)
+        old_values = ', '.join(f'old.{column}' for column in columns)
+        self._conn.executescript(f"""
+            CREATE TRIGGER IF NOT EXISTS busqueda_insert AFTER INSERT ON detalles BEGIN
+                INSERT INTO busqueda (rowid, {', '.join(columns)}) VALUES (new.concurso_id, {new_values});
+            END;
+            CREATE TRIGGER IF NOT EXISTS busqueda_delete AFTER DELETE ON detalles BEGIN
+                INSERT INTO busqueda (busqueda, rowid, {', '.join(columns)}) VALUES ('delete', old.concurso_id, {old_values});
+            END;
+            CREATE TRIGGER IF NOT EXISTS busqueda_update AFTER UPDATE ON detalles BEGIN
+                INSERT INTO busqueda (busqueda, rowid, {', '.join(columns)}) VALUES ('delete', old.concurso_id, {old_values});
+                INSERT INTO busqueda (rowid, {', '.join(columns)}) VALUES (new.concurso_id, {new_values});
+            END;
+        """)
+        if not exists:
+            # Indexar los concursos guardados antes de crear el índice
+            self._conn.execute("INSERT INTO busqueda (busqueda) VALUES ('rebuild')")
+        return True
+
+    def count(self):
+        """
+        Returns:
+            int: Número de URLs registradas
+        """
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM concursos").fetchone()[0]
+
+    def get_id(self, url):
+        """
+        Retorna el ID estable de una URL.
+
+        Args:
+            url (str): URL del concurso
+
+        Returns:
+            int: ID del concurso o None si la URL no está registrada
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT id FROM concursos WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def url_set(self):
+        """
+        Returns:
+            set: Todas las URLs registradas, para consultas repetidas sin acceder a la base de datos
+        """
+        with self._lock:
+            return {url for url, in self._conn.execute("SELECT url FROM concursos")}
+
+    def record_discovery(self, pages, total_pages, new_urls, complete=False):
+        """
+        Registra un recorrido del listado de concursos.
+
+        Args:
+            pages (int): Páginas del listado recorridas
+            total_pages (int): Total de páginas del listado (0 si no se conoce)
+            new_urls (int): URLs nuevas encontradas
+            complete (bool): Si se recorrió el listado completo
+        """
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO descubrimientos (fecha, paginas, total_paginas, urls_nuevas, completo) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (now, pages, total_pages, new_urls, int(complete))
+            )
+
+    def last_discovery(self, complete=False):
+        """
+        Retorna el último recorrido registrado del listado.
+
+        Args:
+            complete (bool): Si es True, el último recorrido completo
+
+        Returns:
+            dict: Llaves fecha, paginas, total_paginas, urls_nuevas y completo, o
+                None si no hay recorridos registrados
+        """
+        query = "SELECT fecha, paginas, total_paginas, urls_nuevas, completo FROM descubrimientos"
+        if complete:
+            query += " WHERE completo = 1"
+        with self._lock:
+            row = self._conn.execute(query + " ORDER BY id DESC LIMIT 1").fetchone()
+        if row is None:
+            return None
+        keys = ('fecha', 'paginas', 'total_paginas', 'urls_nuevas', 'completo')
+        return dict(zip(keys, row))
+
+    def add_urls(self, urls):
+        """
+        Registra URLs nuevas con IDs estables.
+
+        Las URLs se reciben en el orden del listado (de la más reciente a la más
+        antigua) y se registran en orden inverso, de modo que los concursos más
+        recientes reciben los IDs más altos.
+
+        Args:
+            urls (list): URLs encontradas en el listado
+
+        Returns:
+            int: Número de URLs que no estaban registradas
+        """
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with self._lock, self._conn:
+            before = self._conn.execute("SELECT COUNT(*) FROM concursos").fetchone()[0]
+            self._conn.executemany(
+                "INSERT INTO concursos (url, primera_vez, ultima_vez) VALUES (?, ?, ?) "
+                "ON CONFLICT (url) DO UPDATE SET ultima_vez = excluded.ultima_vez",
+                [(url, now, now) for url in reversed(urls)]
+            )
+            after = self._conn.execute("SELECT COUNT(*) FROM concursos").fetchone()[0]
+        return after - before
+
+    def upsert_details(self, records, track_progress=True):
+        """
+        Guarda la información detallada de varios concursos en una transacción.
+
+        Para los concursos que ya tenían información se registra en la tabla
+        cambios cada campo de CAMPOS_SEGUIDOS cuyo hash cambió, con la fecha
+        FECHA_EXTRACCION del registro nuevo.
+
+        Las columnas que faltan en un registro (por ejemplo, las que no existían
+        en los CSV de versiones anteriores) se guardan como NULL, de modo que el
+        primer valor extraído después no se registra como un cambio.
+
+        Args:
+            records (list): Registros con la llave URL y las columnas de COLUMNAS_DB
+            track_progress (bool): Si es False, los concursos no se registran como
+                guardados en la ejecución en curso (ver finish_run); lo usan los
+                procesos que llevan su propio avance, como el backfill
+
+        Returns:
+            int: Número de cambios registrados
+        """
+        columns = list(COLUMNAS_DB.values())
+        placeholders = ', '.join('?' for _ in range(len(columns) + 1))
+        updates = ', '.join(f'{column} = excluded.{column}' for column in columns)
+        rows = []
+        for record in records:
+            concurso_id = self._ensure_id(record['URL'])
+            rows.append([concurso_id] + [record.get(field) for field in COLUMNAS_DB])
+        if not rows:
+            return 0
+        tracked = [COLUMNAS_DB[field] for field in CAMPOS_SEGUIDOS]
+        with self._lock, self._conn:
+            previous = {}
+            ids = [row[0] for row in rows]
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                previous.update((row[0], row[1:]) for row in self._conn.execute(
+                    f"SELECT concurso_id, {', '.join(tracked)} FROM detalles "
+                    f"WHERE concurso_id IN ({', '.join('?' for _ in chunk)})", chunk
+                ))
+            changes = []
+            for row in rows:
+                if row[0] not in previous:
+                    continue
+                new = dict(zip(COLUMNAS_DB, row[1:]))
+                for field, old_value in zip(CAMPOS_SEGUIDOS, previous[row[0]]):
+                    if old_value is None:
+                        # Columna agregada después de guardar la versión anterior
+                        continue
+                    old_hash, new_hash = field_hash(old_value), field_hash(new[field])
+                    if old_hash != new_hash:
+                        changes.append((row[0], field, old_hash, new_hash, new['FECHA_EXTRACCION']))
+            self._conn.executemany(
+                "INSERT INTO cambios (concurso_id, campo, hash_anterior, hash_nuevo, fecha) VALUES (?, ?, ?, ?, ?)",
+                changes
+            )
+            self._conn.executemany(
+                f"INSERT INTO detalles (concurso_id, {', '.join(columns)}) VALUES ({placeholders}) "
+                f"ON CONFLICT (concurso_id) DO UPDATE SET {updates}",
+                rows
+            )
+            if track_progress:
+                self._conn.executemany("INSERT OR IGNORE INTO progreso (concurso_id) VALUES (?)",
+                                       [(row[0],) for row in rows])
+        return len(changes)
+
+    def _ensure_id(self, url):
+        concurso_id = self.get_id(url)
+        if concurso_id is None:
+            self.add_urls([url])
+            concurso_id = self.get_id(url)
+        return concurso_id
+
+    def urls_to_scrape(self):
+        """
+        Retorna los concursos cuya información detallada debe extraerse.
+
+        Se omiten los concursos ya guardados en la ejecución en curso.
+
+        Returns:
+            list: Tuplas (id, url) de los concursos pendientes, del más reciente al más antiguo
+        """
+        query = """
+            SELECT id, url FROM concursos
+            WHERE id NOT IN (SELECT concurso_id FROM progreso)
+            ORDER BY id DESC
+        """
+        with self._lock:
+            return self._conn.execute(query).fetchall()
+
+    def refresh_candidates(self):
+        """
+        Retorna los datos que usa el planificador de actualizaciones para cada concurso.
+
+        Se omiten los concursos ya guardados en la ejecución en curso.
+
+        Returns:
+            list: Diccionarios con las llaves id, url, estado, cierre, fallo,
+                fecha_extraccion y ultimo_cambio (None si el concurso no tiene
+                información detallada o cambios registrados)
+        """
+        query = """
+            SELECT c.id, c.url, d.estado, d.cierre, d.fallo, d.fecha_extraccion,
+                   (SELECT MAX(fecha) FROM cambios WHERE concurso_id = c.id)
+            FROM concursos c
+            LEFT JOIN detalles d ON d.concurso_id = c.id
+            WHERE c.id NOT IN (SELECT concurso_id FROM progreso)
+        """
+        keys = ('id', 'url', 'estado', 'cierre', 'fallo', 'fecha_extraccion', 'ultimo_cambio')
+        with self._lock:
+            rows = self._conn.execute(query).fetchall()
+        return [dict(zip(keys, row)) for row in rows]
+
+    def resumed_count(self):
+        """
+        Returns:
+            int: Concursos ya guardados por una ejecución anterior que no terminó
+        """
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM progreso").fetchone()[0]
+
+    def finish_run(self):
+        """Marca la ejecución como terminada, de modo que la siguiente empieza de cero."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM progreso")
+
+    def backfill_done(self, job):
+        """
+        Args:
+            job (str): Identificador del backfill
+
+        Returns:
+            set: URLs ya guardadas por el backfill
+        """
+        with self._lock:
+            return {url for url, in self._conn.execute(
+                "SELECT c.url FROM backfill b JOIN concursos c ON c.id = b.concurso_id WHERE b.trabajo = ?", (job,)
+            )}
+
+    def mark_backfilled(self, job, urls):
+        """
+        Registra URLs guardadas por un backfill.
+
+        Args:
+            job (str): Identificador del backfill
+            urls (list): URLs guardadas
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO backfill (trabajo, concurso_id) SELECT ?, id FROM concursos WHERE url = ?",
+                [(job, url) for url in urls]
+            )
+
+    def reset_backfill(self, job):
+        """
+        Olvida el progreso de un backfill, de modo que se vuelva a ejecutar completo.
+
+        Args:
+            job (str): Identificador del backfill
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM backfill WHERE trabajo = ?", (job,))
+
+    def changes_since(self, fecha, campos=None):
+        """
+        Retorna los cambios registrados desde una fecha.
+
+        Args:
+            fecha (str): Fecha en formato '%Y-%m-%d' o '%Y-%m-%d %H:%M:%S'; se
+                incluyen los cambios de esa fecha en adelante
+            campos (list): Si se indica, sólo los cambios de estos campos (por
+                ejemplo ['ESTADO', 'BITÁCORA', 'RESULTADOS'])
+
+        Returns:
+            list: Diccionarios con las llaves ID, URL, CAMPO, HASH_ANTERIOR,
+                HASH_NUEVO y FECHA, del cambio más antiguo al más reciente
+        """
+        query = """
+            SELECT c.id, c.url, k.campo, k.hash_anterior, k.hash_nuevo, k.fecha
+            FROM cambios k JOIN concursos c ON c.id = k.concurso_id
+            WHERE k.fecha >= ?
+        """
+        params = [fecha]
+        if campos:
+            query += f" AND k.campo IN ({', '.join('?' for _ in campos)})"
+            params.extend(campos)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY k.fecha, k.id", params).fetchall()
+        keys = ('ID', 'URL', 'CAMPO', 'HASH_ANTERIOR', 'HASH_NUEVO', 'FECHA')
+        return [dict(zip(keys, row)) for row in rows]
+
+    def search(self, query, limit=20):
+        """
+        Busca concursos por el texto de su nombre y sus pestañas.
+
+        La búsqueda no distingue mayúsculas ni tildes. Las palabras de una
+        consulta simple se buscan como prefijos (por ejemplo, "investigacion"
+        encuentra "investigaciones") y deben aparecer todas; las consultas con
+        operadores de FTS5 (comillas, AND, OR, NOT, NEAR) se usan tal cual y, si
+        no son válidas, se buscan como una consulta simple.
+
+        Args:
+            query (str): Texto a buscar
+            limit (int): Máximo de resultados
+
+        Returns:
+            list: Diccionarios con las llaves ID, URL, NOMBRE, ESTADO, FRAGMENTO y
+                RANGO (menor es más relevante), del más al menos relevante
+
+        Raises:
+            RuntimeError: Si SQLite no tiene soporte para FTS5
+        """
+        if not self.search_enabled:
+            raise RuntimeError("La versión de SQLite no tiene soporte para FTS5")
+        simple = ' '.join('"' + word.replace('"', '') + '"*' for word in query.split())
+        if not simple:
+            return []
+        explicit = any(operator in f' {query} ' for operator in _FTS_OPERADORES)
+        weights = ', '.join(str(weight) for weight in CAMPOS_BUSQUEDA.values())
+        sql = f"""
+            SELECT c.id, c.url, d.nombre, d.estado,
+                   snippet(busqueda, -1, '[', ']', '…', 12), bm25(busqueda, {weights}) AS rango
+            FROM busqueda
+            JOIN detalles d ON d.concurso_id = busqueda.rowid
+            JOIN concursos c ON c.id = d.concurso_id
+            WHERE busqueda MATCH ?
+            ORDER BY rango
+            LIMIT ?
+        """
+        with self._lock:
+            try:
+                rows = self._conn.execute(sql, (query if explicit else simple, limit)).fetchall()
+            except sqlite3.OperationalError:
+                if not explicit:
+                    raise
+                # Sintaxis de FTS5 inválida (por ejemplo, comillas sin cerrar)
+                rows = self._conn.execute(sql, (simple, limit)).fetchall()
+        keys = ('ID', 'URL', 'NOMBRE', 'ESTADO', 'FRAGMENTO', 'RANGO')
+        return [dict(zip(keys, row)) for row in rows]
+
+    def iter_details(self):
+        """
+        Recorre la información detallada de todos los concursos sin cargarla en memoria.
+
+        Yields:
+            ConcursoRecord: Registro con las columnas ID, URL y las de COLUMNAS_DB
+        """
+        attributes = ['id', 'url'] + list(COLUMNAS_DB.values())
+        columns = ', '.join(f'd.{column}' for column in COLUMNAS_DB.values())
+        with self._lock:
+            cursor = self._conn.execute(
+                f"SELECT c.id, c.url, {columns} FROM detalles d "
+                f"JOIN concursos c ON c.id = d.concurso_id ORDER BY c.id DESC"
+            )
+            rows = cursor.fetchmany(500)
+        while rows:
+            for row in rows:
+                yield ConcursoRecord.from_row(row, attributes)
+            with self._lock:
+                rows = cursor.fetchmany(500)
+
+    def export_urls_csv(self, path):
+        """
+        Exporta las URLs registradas a un CSV con las columnas ID y URL.
+
+        Args:
+            path (str): Ruta del CSV
+
+        Returns:
+            int: Número de filas exportadas
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT id, url FROM concursos ORDER BY id DESC").fetchall()
+        return write_csv(path, ['ID', 'URL'], ({'ID': concurso_id, 'URL': url} for concurso_id, url in rows))
+
+    def export_details_csv(self, path, columns):
+        """
+        Exporta la información detallada a un CSV.
+
+        Args:
+            path (str): Ruta del CSV
+            columns (list): Columnas del CSV
+
+        Returns:
+            int: Número de filas exportadas
+        """
+        return write_csv(path, columns, self.iter_details())
+
+    def import_csv(self, urls_csv, details_csv):
+        """
+        Importa los CSV generados por versiones anteriores del scraper.
+
+        Args:
+            urls_csv (str): Ruta del CSV de URLs (puede no existir)
+            details_csv (str): Ruta del CSV detallado (puede no existir)
+
+        Returns:
+            int: Número de URLs importadas
+        """
+        urls = []
+        if os.path.exists(urls_csv):
+            # El CSV antiguo tiene los concursos más recientes primero
+            urls = [row['URL'] for row in iter_csv_rows(urls_csv)]
+        self.add_urls(urls)
+        if os.path.exists(details_csv):
+            batch = []
+            for row in iter_csv_rows(details_csv):
+                batch.append(row)
+                if len(batch) >= 500:
+                    self.upsert_details(batch)
+                    batch = []
+            self.upsert_details(batch)
+        self.finish_run()
+        return self.count()
+
+    def close(self):
+        """Cierra la conexión con la base de datos."""
+        with self._lock:
+            self._conn.close()
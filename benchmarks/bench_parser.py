@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark del extractor de la página de detalle.
+
+Compara las páginas por segundo de parse_concurso_details() (BeautifulSoup) y de
+anid_parser.extract_concurso_record() (lxml + XPath precompilado), y verifica
+que ambos produzcan exactamente el mismo registro.
+
+Uso:
+    python benchmarks/bench_parser.py                 # páginas sintéticas
+    python benchmarks/bench_parser.py pagina1.html ... # HTML guardado
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from ANID_scraper import parse_concurso_details
+from anid_parser import extract_concurso_record
+
+
+def build_synthetic_page(seed=0, paragraphs=40):
+    """
+    Construye una página de concurso con la estructura de anid.cl.
+
+    Args:
+        seed (int): Valor usado para variar el contenido entre páginas
+        paragraphs (int): Párrafos por pestaña
+
+    Returns:
+        str: HTML de la página
+    """
+    menu = ''.join(
+        f'<li class="menu-item"><a href="https://anid.cl/seccion-{i}/">Sección {i}</a></li>\n'
+        for i in range(300)
+    )
+    fields = ''.join(
+        f'<div class="elementor-widget"><div class="jet-listing-dynamic-field__content">Campo {i}</div></div>\n'
+        for i in range(40)
+    )
+    tabs = ''
+    for number, tab_id in enumerate(('1911', '1912', '1913', '1914', '1915')):
+        body = ''.join(
+            f'<p>Párrafo {j} de la pestaña {number} del concurso {seed}: '
+            f'<strong>bases</strong> y <a href="/doc-{seed}-{j}.pdf">anexo {j}</a>.</p>\n'
+            for j in range(paragraphs)
+        )
+        if tab_id == '1911':
+            body += '<p>Dirija sus consultas a través de la plataforma de ayuda.</p>'
+        tabs += (
+            f'<div id="jet-tabs-control-{tab_id}" class="jet-tabs__control">Pestaña {number}</div>\n'
+            f'<div id="jet-tabs-content-{tab_id}" class="jet-tabs__content">\n'
+            f'<style>.x{seed}{{color:red}}</style>\n{body}</div>\n'
+        )
+    return f'''<!DOCTYPE html>
+<html lang="es"><head><meta charset="utf-8"><title>Concurso {seed}</title>
+<script>window.dataLayer = window.dataLayer || [];</script>
+</head><body>
+<nav><ul>{menu}</ul></nav>
+<section class="elementor-section">
+<span class="estado">Cerrado</span>
+<div class="jet-listing-dynamic-field__content">Inicio: 1{seed % 10} de mayo, 2023</div>
+<div class="jet-listing-dynamic-field__content">Cierre: 20 de junio, 2023 17:00</div>
+<div class="jet-listing-dynamic-field__content">Fallo estimado: agosto 2023</div>
+{fields}
+<p class="elementor-heading-title elementor-size-default">Concurso Nacional</p>
+<h1 class="elementor-heading-title elementor-size-default">Fondecyt Regular {seed}</h1>
+</section>
+<div class="jet-tabs">{tabs}</div>
+<footer><!-- pie --><script>console.log("fin");</script></footer>
+</body></html>
+'''
+
+
+def measure(parser, pages, repeat):
+    """
+    Mide las páginas por segundo de un extractor.
+
+    Args:
+        parser (callable): Función (html, url) -> dict
+        pages (list): Lista de tuplas (url, html)
+        repeat (int): Número de pasadas sobre las páginas
+
+    Returns:
+        float: Páginas procesadas por segundo
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for url, html in pages:
+            parser(html, url)
+    return len(pages) * repeat / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('files', nargs='*', help='Archivos HTML de páginas de concursos')
+    parser.add_argument('--pages', type=int, default=20, help='Páginas sintéticas a generar')
+    parser.add_argument('--repeat', type=int, default=5, help='Pasadas sobre las páginas')
+    args = parser.parse_args()
+
+    if args.files:
+        pages = []
+        for path in args.files:
+            with open(path, encoding='utf-8') as f:
+                pages.append((path, f.read()))
+    else:
+        pages = [(f'https://anid.cl/concursos/sintetico-{i}/', build_synthetic_page(i)) for i in range(args.pages)]
+
+    # Ambos extractores deben producir el mismo registro
+    for url, html in pages:
+        expected = parse_concurso_details(url, html)
+        actual = extract_concurso_record(html, url, expected['FECHA_EXTRACCION'])
+        if actual != expected:
+            fields = [field for field in expected if expected[field] != actual.get(field)]
+            print(f"✗ Los extractores difieren en {url}: {', '.join(fields)}")
+            return 1
+
+    size = sum(len(html) for _, html in pages) / len(pages) / 1024
+    print(f"{len(pages)} páginas de {size:.0f} KB en promedio, {args.repeat} pasadas")
+    bs4_rate = measure(lambda html, url: parse_concurso_details(url, html), pages, args.repeat)
+    print(f"BeautifulSoup (parse_concurso_details):  {bs4_rate:8.1f} páginas/s")
+    lxml_rate = measure(extract_concurso_record, pages, args.repeat)
+    print(f"lxml (extract_concurso_record):          {lxml_rate:8.1f} páginas/s")
+    print(f"Aceleración: {lxml_rate / bs4_rate:.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
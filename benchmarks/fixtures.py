@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Fixtures de los benchmarks: páginas del listado y de detalle de anid.cl.
+
+Las páginas se guardan con la misma estructura de rutas que el sitio, de modo
+que benchmarks/server.py puede servirlas directamente:
+
+    concursos/index.html                            primera página del listado
+    concursos/jsf/jet-engine/pagenum/N/index.html   página N del listado
+    concursos/<slug>/index.html                     página de un concurso
+
+Por defecto se generan páginas sintéticas con la estructura del sitio (ver
+bench_parser.build_synthetic_page); con --grabar se descargan páginas reales de
+anid.cl y los enlaces del listado se reescriben como rutas relativas.
+
+Uso:
+    python benchmarks/fixtures.py                     # 120 concursos sintéticos
+    python benchmarks/fixtures.py --concursos 500
+    python benchmarks/fixtures.py --grabar 5          # 5 páginas reales del listado
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_parser import build_synthetic_page
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+CONCURSOS_POR_PAGINA = 12
+
+
+def listado_page(slugs, page, total_pages):
+    """
+    Construye una página del listado de concursos con la estructura de anid.cl.
+
+    Args:
+        slugs (list): Slugs de los concursos de la página
+        page (int): Número de la página
+        total_pages (int): Total de páginas del listado
+
+    Returns:
+        str: HTML de la página
+    """
+    items = ''.join(
+        f'<div class="jet-listing-grid__item"><h3>Concurso {slug}</h3>'
+        f'<a class="elementor-button elementor-button-link elementor-size-sm" href="/concursos/{slug}/">'
+        f'<span class="elementor-button-text">Ver más</span></a></div>\n'
+        for slug in slugs
+    )
+    pagination = ''.join(
+        f'<div class="jet-filters-pagination__item{" jet-filters-pagination__current" if number == page else ""}" '
+        f'data-value="{number}"><div class="jet-filters-pagination__link">{number}</div></div>'
+        for number in range(1, total_pages + 1)
+    )
+    return f'''<!DOCTYPE html>
+<html lang="es"><head><meta charset="utf-8"><title>Concursos - Página {page}</title></head><body>
+<div class="jet-listing-grid">{items}</div>
+<div class="jet-filters-pagination">{pagination}</div>
+</body></html>
+'''
+
+
+def _write(root, path, html):
+    path = os.path.join(root, path, 'index.html')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(html)
+
+
+def _listado_path(page):
+    return 'concursos' if page == 1 else f'concursos/jsf/jet-engine/pagenum/{page}'
+
+
+def build_fixtures(root=FIXTURES_DIR, concursos=120, per_page=CONCURSOS_POR_PAGINA, paragraphs=40):
+    """
+    Genera fixtures sintéticos (el resultado es siempre el mismo para los mismos parámetros).
+
+    Args:
+        root (str): Directorio de los fixtures (se reemplaza)
+        concursos (int): Número de concursos
+        per_page (int): Concursos por página del listado
+        paragraphs (int): Párrafos por pestaña de cada concurso
+
+    Returns:
+        dict: Descripción de los fixtures (también se guarda en root/fixtures.json)
+    """
+    shutil.rmtree(root, ignore_errors=True)
+    # Del más reciente al más antiguo, como en el listado del sitio
+    slugs = [f'concurso-sintetico-{i:04d}' for i in range(concursos - 1, -1, -1)]
+    total_pages = max(1, -(-concursos // per_page))
+    for page in range(1, total_pages + 1):
+        page_slugs = slugs[(page - 1) * per_page:page * per_page]
+        _write(root, _listado_path(page), listado_page(page_slugs, page, total_pages))
+    for i, slug in enumerate(reversed(slugs)):
+        _write(root, f'concursos/{slug}', build_synthetic_page(i, paragraphs))
+    info = {'origen': 'sintetico', 'concursos': concursos, 'paginas': total_pages,
+            'slugs': slugs, 'parrafos': paragraphs}
+    with open(os.path.join(root, 'fixtures.json'), 'w', encoding='utf-8') as f:
+        json.dump(info, f, ensure_ascii=False, indent=2)
+    return info
+
+
+def record_fixtures(root=FIXTURES_DIR, paginas=3):
+    """
+    Descarga páginas reales de anid.cl como fixtures.
+
+    Args:
+        root (str): Directorio de los fixtures (se reemplaza)
+        paginas (int): Número de páginas del listado a descargar, junto con sus concursos
+
+    Returns:
+        dict: Descripción de los fixtures (también se guarda en root/fixtures.json)
+    """
+    import ANID_scraper as scraper
+
+    shutil.rmtree(root, ignore_errors=True)
+    urls, total_pages = scraper.parse_listado_page(scraper.fetch_html(scraper.LISTADO_URL))
+    paginas = min(paginas, total_pages)
+    slugs = []
+    for page in range(1, paginas + 1):
+        url = scraper.LISTADO_URL if page == 1 else scraper.LISTADO_PAGINA_URL.format(page=page)
+        html = scraper.fetch_html(url)
+        # Los enlaces absolutos al sitio se reescriben para que apunten al servidor local
+        _write(root, _listado_path(page), html.replace(scraper.LISTADO_URL, '/concursos/'))
+        for concurso_url in scraper.parse_listado_page(html)[0]:
+            slug = concurso_url[len(scraper.LISTADO_URL):].strip('/')
+            if slug and slug not in slugs:
+                slugs.append(slug)
+                _write(root, f'concursos/{slug}', scraper.fetch_html(concurso_url))
+                print(f"Grabado {concurso_url}")
+    info = {'origen': scraper.LISTADO_URL, 'concursos': len(slugs), 'paginas': paginas, 'slugs': slugs}
+    with open(os.path.join(root, 'fixtures.json'), 'w', encoding='utf-8') as f:
+        json.dump(info, f, ensure_ascii=False, indent=2)
+    return info
+
+
+def load_fixtures(root=FIXTURES_DIR, concursos=120):
+    """
+    Retorna la descripción de los fixtures, generándolos si no existen.
+
+    Los fixtures grabados de anid.cl se usan tal cual; los sintéticos se
+    regeneran si tienen un número distinto de concursos.
+
+    Args:
+        root (str): Directorio de los fixtures
+        concursos (int): Número de concursos sintéticos a generar si hace falta
+
+    Returns:
+        dict: Descripción de los fixtures
+    """
+    path = os.path.join(root, 'fixtures.json')
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            info = json.load(f)
+        if info['origen'] != 'sintetico' or info['concursos'] == concursos:
+            return info
+    return build_fixtures(root, concursos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dir', default=FIXTURES_DIR, help='Directorio de los fixtures')
+    parser.add_argument('--concursos', type=int, default=120, help='Concursos sintéticos a generar')
+    parser.add_argument('--grabar', type=int, metavar='PAGINAS', help='Descargar PAGINAS páginas reales del listado')
+    args = parser.parse_args()
+
+    if args.grabar:
+        info = record_fixtures(args.dir, args.grabar)
+    else:
+        info = build_fixtures(args.dir, args.concursos)
+    print(f"{info['concursos']} concursos en {info['paginas']} páginas del listado guardados en {args.dir}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
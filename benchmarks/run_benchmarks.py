@@ -0,0 +1,351 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmarks del ANID Scraper sin conexión a anid.cl.
+
+Levanta benchmarks/server.py con los fixtures (ver fixtures.py) y mide:
+
+    discovery    recorrido del listado por HTTP (get_anid_urls_http), completo y
+                 en modo incremental con sólo los 3 concursos más recientes sin registrar
+    fetch        descarga de páginas de detalle en paralelo (fetch_page)
+    parse        extracción de la información (lxml y BeautifulSoup)
+    end_to_end   process_concursos() completo en un directorio temporal, en
+                 frío (base de datos vacía) y de nuevo en modo incremental
+    startup      tiempo de arranque de `python ANID_scraper.py --help` y de
+                 la importación del módulo, y qué dependencias pesadas carga
+
+Los resultados se guardan en JSON; con --comparar se contrastan con un archivo
+anterior y el script termina con código 1 si alguna métrica empeoró más que la
+tolerancia, de modo que puede usarse antes de un despliegue. El script también
+termina con código 1 si el arranque supera --presupuesto-arranque o si la
+importación de ANID_scraper carga algún módulo de IMPORTACIONES_DIFERIDAS.
+
+Uso:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --latencia 0.05 --errores 0.02 --429 0.02
+    python benchmarks/run_benchmarks.py --solo parse,fetch --comparar base.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..'))
+
+import ANID_scraper as scraper
+from anid_parser import extract_concurso_record
+from bench_parser import measure
+from fixtures import FIXTURES_DIR, load_fixtures
+from server import FixtureServer
+
+SUITES = ['discovery', 'fetch', 'parse', 'end_to_end', 'startup']
+RESULTADOS_JSON = os.path.join(BENCH_DIR, 'resultados', 'ultimo.json')
+SCRAPER_PY = os.path.join(BENCH_DIR, '..', 'ANID_scraper.py')
+# Dependencias que sólo deben importarse en los comandos que las usan
+IMPORTACIONES_DIFERIDAS = ('selenium', 'bs4', 'requests', 'pandas', 'pyarrow', 'concurrent.futures', 'uuid')
+
+
+def configure_scraper(base_url, args):
+    """
+    Apunta el scraper al servidor local y desactiva Selenium.
+
+    Args:
+        base_url (str): URL base del servidor de fixtures
+        args (argparse.Namespace): Configuración del benchmark
+    """
+    scraper.LISTADO_URL = base_url + '/concursos/'
+    scraper.LISTADO_PAGINA_URL = scraper.LISTADO_URL + 'jsf/jet-engine/pagenum/{page}/'
+    scraper.MAX_CONCURRENCIA_POR_HOST = args.concurrencia
+    # Los semáforos por host ya creados conservan el límite anterior
+    scraper._host_semaphores.clear()
+    scraper.rate_limiter = scraper.RateLimiter(rate=args.tasa, burst=max(args.concurrencia, 1))
+    # Sin navegador: las páginas que fallan cuentan como error
+    scraper.get_concurso_details_selenium = lambda url: None
+    scraper.get_anid_urls_selenium = lambda existing_urls, full=False: {'urls': [], 'paginas': 0, 'completo': False}
+
+
+@contextlib.contextmanager
+def quiet():
+    """Descarta los mensajes del scraper, que afectarían las mediciones."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def bench_discovery(server, info, args):
+    scraper.USAR_CACHE = False
+    start = time.perf_counter()
+    with quiet():
+        listado = scraper.get_anid_urls_http(set())
+    elapsed = time.perf_counter() - start
+    known = set(f"{scraper.LISTADO_URL}{slug}/" for slug in info['slugs'][3:])
+    start = time.perf_counter()
+    with quiet():
+        incremental = scraper.get_anid_urls_http(known)
+    return {
+        'segundos': elapsed,
+        'paginas_por_segundo': info['paginas'] / elapsed,
+        'urls': len(listado['urls']) if listado else 0,
+        'urls_esperadas': info['concursos'],
+        'incremental_segundos': time.perf_counter() - start,
+        'incremental_paginas': incremental['paginas'] if incremental else 0,
+        'incremental_urls': len(incremental['urls']) if incremental else 0,
+    }
+
+
+def bench_fetch(server, info, args):
+    scraper.USAR_CACHE = False
+    urls = [f"{scraper.LISTADO_URL}{slug}/" for slug in info['slugs']]
+    errors = 0
+    size = 0
+
+    def fetch(url):
+        try:
+            return len(scraper.fetch_page(url)[0])
+        except Exception:
+            return None
+
+    start = time.perf_counter()
+    with quiet(), ThreadPoolExecutor(max_workers=args.concurrencia) as executor:
+        for length in executor.map(fetch, urls):
+            if length is None:
+                errors += 1
+            else:
+                size += length
+    elapsed = time.perf_counter() - start
+    return {
+        'segundos': elapsed,
+        'paginas_por_segundo': len(urls) / elapsed,
+        'mb_por_segundo': size / elapsed / 1024 / 1024,
+        'errores': errors,
+        'tasa_final': scraper.rate_limiter.rate,
+    }
+
+
+def bench_parse(server, info, args):
+    pages = []
+    for slug in info['slugs']:
+        with open(os.path.join(FIXTURES_DIR, 'concursos', slug, 'index.html'), encoding='utf-8') as f:
+            pages.append((f"{scraper.LISTADO_URL}{slug}/", f.read()))
+    lxml_rate = measure(extract_concurso_record, pages, args.repeticiones)
+    # BeautifulSoup es mucho más lento: se mide con una sola pasada sobre un subconjunto
+    sample = pages[:20]
+    bs4_rate = measure(lambda html, url: scraper.parse_concurso_details(url, html), sample, 1)
+    return {
+        'lxml_paginas_por_segundo': lxml_rate,
+        'bs4_paginas_por_segundo': bs4_rate,
+        'kb_por_pagina': sum(len(html) for _, html in pages) / len(pages) / 1024,
+    }
+
+
+def _reset_scraper(workdir):
+    # Rutas de salida en el directorio temporal y recursos compartidos sin abrir
+    for name in ('_store', '_http_cache', '_html_archive', '_document_store'):
+        resource = getattr(scraper, name)
+        if resource is not None:
+            resource.close()
+        setattr(scraper, name, None)
+    scraper.BASE_DATOS = os.path.join(workdir, 'ANID_concursos.sqlite')
+    scraper.URLS_CSV = os.path.join(workdir, 'ANID_concursos.csv')
+    scraper.DETALLES_CSV = os.path.join(workdir, 'ANID_concursos_detallado.csv')
+    scraper.CACHE_DB = os.path.join(workdir, 'ANID_cache.sqlite')
+    scraper.ARCHIVO_HTML = os.path.join(workdir, 'ANID_archivo.warc.gz')
+    scraper.DOCUMENTOS_DIR = os.path.join(workdir, 'ANID_documentos')
+
+
+def bench_end_to_end(server, info, args):
+    scraper.USAR_CACHE = True
+    results = {}
+    workdir = tempfile.mkdtemp(prefix='anid_bench_')
+    try:
+        _reset_scraper(workdir)
+        for run in ('frio', 'incremental'):
+            start = time.perf_counter()
+            with quiet():
+                scraper.process_concursos(max_workers=args.concurrencia, pipeline=args.pipeline)
+            results[f'{run}_segundos'] = time.perf_counter() - start
+        results['concursos_por_segundo'] = info['concursos'] / results['frio_segundos']
+        results['concursos_guardados'] = scraper.get_store().count()
+    finally:
+        _reset_scraper(workdir)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def bench_startup(server, info, args):
+    def run(command):
+        start = time.perf_counter()
+        result = subprocess.run(command, cwd=os.path.dirname(SCRAPER_PY), capture_output=True, text=True, check=True)
+        return time.perf_counter() - start, result.stdout
+
+    check = ('import sys, time; start = time.perf_counter(); import ANID_scraper; '
+             'print(time.perf_counter() - start); '
+             f'print(",".join(m for m in {IMPORTACIONES_DIFERIDAS!r} if m in sys.modules))')
+    python, help_, imports = [], [], []
+    for _ in range(args.repeticiones_arranque):
+        python.append(run([sys.executable, '-c', 'pass'])[0])
+        help_.append(run([sys.executable, SCRAPER_PY, '--help'])[0])
+        lines = run([sys.executable, '-c', check])[1].splitlines()
+        imports.append(float(lines[0]))
+        loaded = lines[1] if len(lines) > 1 else ''
+    return {
+        'interprete_segundos': statistics.median(python),
+        'arranque_segundos': statistics.median(help_),
+        'importacion_segundos': statistics.median(imports),
+        'importaciones_pesadas': loaded or 'ninguna',
+    }
+
+
+def check_startup(result, budget):
+    """
+    Verifica el presupuesto de arranque.
+
+    Args:
+        result (dict): Resultado de bench_startup
+        budget (float): Segundos permitidos para importar ANID_scraper
+
+    Returns:
+        list: Descripción de cada incumplimiento
+    """
+    problems = []
+    if result['importacion_segundos'] > budget:
+        problems.append(f"importar ANID_scraper tomó {result['importacion_segundos'] * 1000:.0f} ms "
+                        f"(presupuesto {budget * 1000:.0f} ms)")
+    if result['importaciones_pesadas'] != 'ninguna':
+        problems.append(f"importar ANID_scraper carga {result['importaciones_pesadas']}")
+    return problems
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(current, baseline, tolerance):
+    """
+    Compara los resultados con un archivo anterior.
+
+    Las métricas *_por_segundo deben ser mayores y las *segundos menores; el
+    resto de las métricas es informativo.
+
+    Args:
+        current (dict): Resultados actuales
+        baseline (dict): Resultados anteriores
+        tolerance (float): Empeoramiento relativo permitido (0.2 = 20%)
+
+    Returns:
+        list: Descripción de cada métrica que empeoró más que la tolerancia
+    """
+    regressions = []
+    for suite, metrics in current['resultados'].items():
+        for metric, value in metrics.items():
+            old = baseline.get('resultados', {}).get(suite, {}).get(metric)
+            if not old or not isinstance(value, (int, float)):
+                continue
+            if metric.endswith('_por_segundo'):
+                change = (old - value) / old
+            elif metric.endswith('segundos'):
+                change = (value - old) / old
+            else:
+                continue
+            marker = ''
+            if change > tolerance:
+                marker = '  ✗ REGRESIÓN'
+                regressions.append(f'{suite}.{metric}: {old:.3f} -> {value:.3f}')
+            print(f"  {suite}.{metric}: {old:.3f} -> {value:.3f} ({-change:+.1%}){marker}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--solo', default=','.join(SUITES), help='Benchmarks a ejecutar, separados por comas')
+    parser.add_argument('--concursos', type=int, default=120, help='Concursos sintéticos si no hay fixtures grabados')
+    parser.add_argument('--latencia', type=float, default=0.02, help='Segundos de espera por respuesta')
+    parser.add_argument('--variacion', type=float, default=0.01, help='Segundos adicionales aleatorios')
+    parser.add_argument('--errores', type=float, default=0.0, help='Probabilidad de responder 503')
+    parser.add_argument('--429', dest='rate_429', type=float, default=0.0, help='Probabilidad de responder 429')
+    parser.add_argument('--retry-after', type=int, default=1, help='Header Retry-After de las respuestas 429')
+    parser.add_argument('--tasa', type=float, default=1000.0,
+                        help='Peticiones por segundo del limitador (por defecto sin límite efectivo)')
+    parser.add_argument('--concurrencia', type=int, default=scraper.MAX_CONCURRENCIA_POR_HOST)
+    parser.add_argument('--pipeline', action='store_true', help='Usar pipeline_concursos en end_to_end')
+    parser.add_argument('--repeticiones', type=int, default=3, help='Pasadas del benchmark parse')
+    parser.add_argument('--repeticiones-arranque', type=int, default=5, help='Pasadas del benchmark startup')
+    parser.add_argument('--presupuesto-arranque', type=float, default=0.1,
+                        help='Segundos permitidos para importar ANID_scraper')
+    parser.add_argument('--salida', default=RESULTADOS_JSON, help='Archivo JSON de resultados')
+    parser.add_argument('--comparar', help='Archivo JSON de resultados anteriores')
+    parser.add_argument('--tolerancia', type=float, default=0.2, help='Empeoramiento permitido al comparar')
+    args = parser.parse_args()
+
+    suites = [suite.strip() for suite in args.solo.split(',') if suite.strip()]
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        parser.error(f"benchmarks desconocidos: {', '.join(sorted(unknown))}")
+
+    info = load_fixtures(FIXTURES_DIR, args.concursos)
+    output = {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+        'fixtures': {'origen': info['origen'], 'concursos': info['concursos'], 'paginas': info['paginas']},
+        'config': {name: value for name, value in vars(args).items() if name not in ('salida', 'comparar')},
+        'resultados': {},
+    }
+
+    benchmarks = {'discovery': bench_discovery, 'fetch': bench_fetch, 'parse': bench_parse,
+                  'end_to_end': bench_end_to_end, 'startup': bench_startup}
+    with FixtureServer(FIXTURES_DIR, args.latencia, args.variacion, args.errores, args.rate_429,
+                       retry_after=args.retry_after) as server:
+        configure_scraper(server.base_url, args)
+        for suite in suites:
+            print(f"Ejecutando {suite}...")
+            result = benchmarks[suite](server, info, args)
+            output['resultados'][suite] = result
+            for metric, value in result.items():
+                print(f"  {metric}: {value:.3f}" if isinstance(value, float) else f"  {metric}: {value}")
+        output['respuestas_servidor'] = {str(status): count for status, count in sorted(server.stats.items())}
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.salida)), exist_ok=True)
+    with open(args.salida, 'w', encoding='utf-8') as f:
+        json.dump(output, f, ensure_ascii=False, indent=2)
+    print(f"Resultados guardados en {args.salida}")
+
+    status = 0
+    if 'startup' in output['resultados']:
+        problems = check_startup(output['resultados']['startup'], args.presupuesto_arranque)
+        for problem in problems:
+            print(f"✗ {problem}")
+        if problems:
+            status = 1
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"Comparación con {args.comparar} (commit {baseline.get('commit')}):")
+        regressions = compare(output, baseline, args.tolerancia)
+        if regressions:
+            print(f"✗ {len(regressions)} métricas empeoraron más de {args.tolerancia:.0%}")
+            return 1
+        print("✓ Sin regresiones")
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
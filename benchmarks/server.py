@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Servidor HTTP local que reemplaza a anid.cl en los benchmarks.
+
+Sirve los fixtures (ver fixtures.py) con ETag e If-None-Match y permite simular
+latencia, errores 5xx y respuestas 429 con Retry-After. Las fallas se generan
+con una semilla fija, de modo que una misma configuración produce la misma
+secuencia de respuestas.
+
+Uso:
+    python benchmarks/server.py --puerto 8000 --latencia 0.05 --errores 0.02 --429 0.02
+
+y luego apuntar LISTADO_URL de ANID_scraper.py a http://127.0.0.1:8000/concursos/.
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlparse
+
+from fixtures import FIXTURES_DIR, load_fixtures
+
+
+class FixtureServer:
+    """
+    Servidor de fixtures con latencia y fallas configurables, en un hilo propio.
+    """
+
+    def __init__(self, root=FIXTURES_DIR, latency=0.0, jitter=0.0, error_rate=0.0, rate_429=0.0,
+                 retry_after=1, port=0, seed=0):
+        """
+        Args:
+            root (str): Directorio de los fixtures
+            latency (float): Segundos de espera antes de cada respuesta
+            jitter (float): Segundos adicionales aleatorios (entre 0 y jitter)
+            error_rate (float): Probabilidad de responder 503
+            rate_429 (float): Probabilidad de responder 429
+            retry_after (int): Valor del header Retry-After de las respuestas 429
+            port (int): Puerto (0 elige uno libre)
+            seed (int): Semilla de las fallas y la latencia aleatoria
+        """
+        self.root = os.path.abspath(root)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.stats = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._etags = {}
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """str: URL base del servidor, sin barra final."""
+        return f'http://127.0.0.1:{self._server.server_address[1]}'
+
+    def _count(self, status):
+        with self._lock:
+            self.stats[status] = self.stats.get(status, 0) + 1
+
+    def _draw(self):
+        # Retorna (espera, estado forzado o None) para la siguiente respuesta
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+            value = self._random.random()
+        if value < self.rate_429:
+            return delay, 429
+        if value < self.rate_429 + self.error_rate:
+            return delay, 503
+        return delay, None
+
+    def _resolve(self, path):
+        # Ruta del archivo de un path de la URL, o None si está fuera de root
+        path = unquote(urlparse(path).path)
+        if path.endswith('/'):
+            path += 'index.html'
+        full = os.path.normpath(os.path.join(self.root, path.lstrip('/')))
+        if not full.startswith(self.root + os.sep):
+            return None
+        if os.path.isdir(full):
+            full = os.path.join(full, 'index.html')
+        return full if os.path.isfile(full) else None
+
+    def _etag(self, path, body):
+        with self._lock:
+            if path not in self._etags:
+                self._etags[path] = '"' + hashlib.md5(body).hexdigest() + '"'
+            return self._etags[path]
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _respond(self, status, body=b'', headers=None, send_body=True):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if send_body and body:
+                    self.wfile.write(body)
+                server._count(status)
+
+            def _serve(self, send_body):
+                delay, forced = server._draw()
+                if delay:
+                    time.sleep(delay)
+                if forced == 429:
+                    return self._respond(429, b'Too Many Requests', {'Retry-After': str(server.retry_after)}, send_body)
+                if forced:
+                    return self._respond(forced, b'Service Unavailable', send_body=send_body)
+                path = server._resolve(self.path)
+                if path is None:
+                    return self._respond(404, b'Not Found', send_body=send_body)
+                with open(path, 'rb') as f:
+                    body = f.read()
+                etag = server._etag(path, body)
+                if self.headers.get('If-None-Match') == etag:
+                    return self._respond(304, headers={'ETag': etag}, send_body=False)
+                self._respond(200, body, {'Content-Type': 'text/html; charset=utf-8', 'ETag': etag}, send_body)
+
+            def do_GET(self):
+                self._serve(True)
+
+            def do_HEAD(self):
+                self._serve(False)
+
+        return Handler
+
+    def start(self):
+        """
+        Inicia el servidor en un hilo.
+
+        Returns:
+            str: URL base del servidor
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def serve_forever(self):
+        """Atiende peticiones en el hilo actual hasta que se interrumpa con Ctrl+C."""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+    def stop(self):
+        """Detiene el servidor."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dir', default=FIXTURES_DIR, help='Directorio de los fixtures')
+    parser.add_argument('--concursos', type=int, default=120, help='Concursos sintéticos si no hay fixtures')
+    parser.add_argument('--puerto', type=int, default=8000)
+    parser.add_argument('--latencia', type=float, default=0.0, help='Segundos de espera por respuesta')
+    parser.add_argument('--variacion', type=float, default=0.0, help='Segundos adicionales aleatorios')
+    parser.add_argument('--errores', type=float, default=0.0, help='Probabilidad de responder 503')
+    parser.add_argument('--429', dest='rate_429', type=float, default=0.0, help='Probabilidad de responder 429')
+    args = parser.parse_args()
+
+    load_fixtures(args.dir, args.concursos)
+    server = FixtureServer(args.dir, args.latencia, args.variacion, args.errores, args.rate_429, port=args.puerto)
+    print(f"Sirviendo {args.dir} en {server.base_url}/concursos/ (Ctrl+C para terminar)")
+    server.serve_forever()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
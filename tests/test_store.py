@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la base de datos de concursos (anid_store.py).
+"""
+
+import csv
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from anid_store import ConcursoStore  # noqa: E402
+
+URL = 'https://anid.cl/concursos/fondecyt-regular-2024/'
+
+# Columnas del CSV detallado de versiones anteriores, sin DOCUMENTOS_URLS
+COLUMNAS_ANTIGUAS = ['ID', 'URL', 'ESTADO', 'NOMBRE', 'TIPO', 'INICIO', 'CIERRE', 'FALLO',
+                     'PRESENTACIÓN', 'PÚBLICO OBJETIVO', 'BITÁCORA', 'RESULTADOS', 'DOCUMENTOS',
+                     'FECHA_EXTRACCION']
+
+
+def _write_csv(path, columns, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def _legacy_store(tmp_path):
+    record = {column: '' for column in COLUMNAS_ANTIGUAS}
+    record.update({
+        'ID': '1', 'URL': URL, 'ESTADO': 'Cerrado', 'NOMBRE': 'Fondecyt Regular 2024',
+        'DOCUMENTOS': 'Bases', 'FECHA_EXTRACCION': '2024-01-01 10:00:00',
+    })
+    _write_csv(tmp_path / 'urls.csv', ['ID', 'URL'], [{'ID': '1', 'URL': URL}])
+    _write_csv(tmp_path / 'detalles.csv', COLUMNAS_ANTIGUAS, [record])
+    store = ConcursoStore(str(tmp_path / 'concursos.sqlite'))
+    store.import_csv(str(tmp_path / 'urls.csv'), str(tmp_path / 'detalles.csv'))
+    return store, record
+
+
+def test_import_then_rescrape_records_no_change_for_new_columns(tmp_path):
+    store, record = _legacy_store(tmp_path)
+    rescraped = dict(record, DOCUMENTOS_URLS='https://anid.cl/wp-content/uploads/bases.pdf',
+                     FECHA_EXTRACCION='2024-02-01 10:00:00')
+
+    assert store.upsert_details([rescraped]) == 0
+    assert store.changes_since('2024-01-01') == []
+
+
+def test_rescrape_after_import_records_changed_fields(tmp_path):
+    store, record = _legacy_store(tmp_path)
+    rescraped = dict(record, ESTADO='Fallado', DOCUMENTOS_URLS='https://anid.cl/bases.pdf',
+                     FECHA_EXTRACCION='2024-02-01 10:00:00')
+
+    assert store.upsert_details([rescraped]) == 1
+    assert [change['CAMPO'] for change in store.changes_since('2024-01-01')] == ['ESTADO']